@@ -0,0 +1,268 @@
+from classes.Automata import Automata
+from classes.EarleyParser import EarleyParser
+from classes.FiniteAutomaton import FiniteAutomaton
+from classes.Grammar import Grammar
+
+from collections import Counter
+from itertools import product
+import os
+import random
+import re
+import tempfile
+import unittest
+
+def grammar(VN, VT, P):
+    # A Grammar holding the given symbols and productions
+    result = Grammar()
+    result.set_grammar(VN, VT, P)
+    return result
+
+def words(alphabet, longest):
+    # Every string over the alphabet up to the given length
+    for length in range(longest + 1):
+        for letters in product(alphabet, repeat=length):
+            yield ''.join(letters)
+
+def trees(forest, node, memo=None):
+    # Number of derivation trees packed under a node of a parse forest
+    memo = {} if memo is None else memo
+    if node not in memo:
+        total = 0
+        for _, children in forest[node]:
+            count = 1
+            for child in children:
+                if isinstance(child, tuple):
+                    count *= trees(forest, child, memo)
+            total += count
+        memo[node] = total
+    return memo[node]
+
+class TestEarleyParser(unittest.TestCase):
+    def assertLanguage(self, g, alphabet, member, longest=7):
+        # The recognizer must agree with the language's own definition on every short string
+        parser = EarleyParser(g)
+        automata = Automata(g)
+        for word in words(alphabet, longest):
+            self.assertEqual(parser.accepts(word), member(word), word)
+            self.assertEqual(automata.check_string(word), member(word), word)
+
+    def test_nullable(self):
+        # S -> aSb | ε: a^n b^n, including the empty string
+        g = grammar(['S'], ['a', 'b'], {'S': ['aSb', '']})
+        self.assertLanguage(g, 'ab', lambda w: len(w) % 2 == 0 and w == 'a' * (len(w) // 2) + 'b' * (len(w) // 2))
+
+    def test_nullable_chain(self):
+        # Nullable symbols in the middle of a rule: S -> ABA c, A -> a | ε, B -> A A
+        g = grammar(['S', 'A', 'B'], ['a', 'c'], {'S': ['ABAc'], 'A': ['a', ''], 'B': ['AA']})
+        self.assertLanguage(g, 'ac', lambda w: re.fullmatch('a{0,4}c', w) is not None)
+
+    def test_left_recursion(self):
+        g = grammar(['S'], ['a', 'b'], {'S': ['Sa', 'b']})
+        self.assertLanguage(g, 'ab', lambda w: re.fullmatch('ba*', w) is not None)
+
+    def test_right_recursion(self):
+        g = grammar(['S'], ['a', 'c'], {'S': ['aS', 'c']})
+        self.assertLanguage(g, 'ac', lambda w: re.fullmatch('a*c', w) is not None)
+
+    def test_left_and_right_recursion(self):
+        g = grammar(['S'], ['a', 'b', 'c'], {'S': ['aS', 'Sb', 'c']})
+        self.assertLanguage(g, 'abc', lambda w: re.fullmatch('a*cb*', w) is not None, longest=6)
+
+    def test_balanced_parentheses(self):
+        g = grammar(['S'], ['(', ')'], {'S': ['(S)S', '']})
+
+        def balanced(w):
+            depth = 0
+            for c in w:
+                depth += 1 if c == '(' else -1
+                if depth < 0:
+                    return False
+            return depth == 0
+        self.assertLanguage(g, '()', balanced, longest=8)
+
+    def test_ambiguous(self):
+        # S -> S+S | a: every string a+a+...+a is accepted, with Catalan-many derivations
+        g = grammar(['S'], ['a', '+'], {'S': ['S+S', 'a']})
+        self.assertLanguage(g, 'a+', lambda w: re.fullmatch(r'a(\+a)*', w) is not None)
+        parser = EarleyParser(g)
+        for operands, catalan in [(1, 1), (2, 1), (3, 2), (4, 5), (5, 14)]:
+            root, forest = parser.parse('+'.join('a' * operands))
+            self.assertEqual(trees(forest, root), catalan)
+        self.assertIsNone(parser.parse('a+'))
+
+    def test_regular_check_string(self):
+        # The default Type 3 grammar goes through the compiled automaton instead of Earley
+        g = Grammar()
+        automata = Automata(g)
+        parser = EarleyParser(g)
+        for word in words('01', 8):
+            self.assertEqual(automata.check_string(word), parser.accepts(word), word)
+        self.assertTrue(automata.check_string('0100'))
+        self.assertFalse(automata.check_string('010'))
+
+def automaton(Q, E, F, sigma):
+    # A FiniteAutomaton holding the given states and transitions
+    result = FiniteAutomaton()
+    result.set_automaton(Q, E, F, sigma)
+    return result
+
+def random_nfa(rng, states, alphabet='ab'):
+    # Random NFA, ε-moves included, over the given number of states
+    Q = [f's{i}' for i in range(states)]
+    sigma = {}
+    for state in Q:
+        for _ in range(rng.randint(0, 4)):
+            sigma.setdefault(state, []).append([rng.choice(alphabet + 'ε'), rng.choice(Q)])
+    return automaton(Q, list(alphabet), rng.sample(Q, rng.randint(0, states)), sigma)
+
+def renamed(fa, rng):
+    # The same automaton with shuffled state names and transition order (the start stays first)
+    names = {state: f'r{i}' for i, state in enumerate([fa.Q[0]] + rng.sample(fa.Q[1:], len(fa.Q) - 1))}
+    sigma = {}
+    for state, moves in fa.sigma.items():
+        moves = [[symbol, names[target]] for symbol, target in moves]
+        rng.shuffle(moves)
+        sigma[names[state]] = moves
+    return automaton([names[state] for state in fa.Q], list(fa.E), [names[state] for state in fa.F], sigma)
+
+class TestMinimize(unittest.TestCase):
+    def assertSameLanguage(self, first, second, alphabet='ab', longest=7):
+        for word in words(alphabet, longest):
+            self.assertEqual(first.accepts(word), second.accepts(word), word)
+
+    def test_same_language(self):
+        rng = random.Random(0)
+        for _ in range(150):
+            fa = random_nfa(rng, rng.randint(1, 6))
+            minimal = fa.minimize()
+            self.assertEqual(minimal.is_dfa(), "DFA")
+            self.assertSameLanguage(fa, minimal)
+            # Minimizing a minimal DFA changes nothing
+            self.assertEqual(str(minimal.minimize()), str(minimal))
+
+    def test_known_minimal_size(self):
+        # (a|b)*abb: the textbook NFA has four states, and so does its minimal DFA
+        fa = automaton(['p', 'q', 'r', 's'], ['a', 'b'], ['s'],
+                       {'p': [['a', 'p'], ['b', 'p'], ['a', 'q']], 'q': [['b', 'r']], 'r': [['b', 's']]})
+        minimal = fa.minimize()
+        self.assertEqual(len(minimal.Q), 4)
+        self.assertSameLanguage(fa, minimal)
+
+    def test_equivalent_automata_give_identical_results(self):
+        rng = random.Random(1)
+        for _ in range(100):
+            fa = random_nfa(rng, rng.randint(1, 6))
+            variants = [fa, renamed(fa, rng), fa.conversion_ndfa_to_dfa()]
+            results = [str(variant.minimize()) for variant in variants]
+            self.assertEqual(results[1], results[0])
+            self.assertEqual(results[2], results[0])
+
+    def test_different_constructions(self):
+        # Two unrelated NFAs for "strings over a, b ending in a": one guesses the last a,
+        # the other tracks it with ε-moves and a redundant copy of every state
+        guess = automaton(['x', 'y'], ['a', 'b'], ['y'], {'x': [['a', 'x'], ['b', 'x'], ['a', 'y']]})
+        track = automaton(['u', 'v', 'u2', 'v2'], ['a', 'b'], ['v', 'v2'],
+                          {'u': [['ε', 'u2'], ['a', 'v']], 'u2': [['b', 'u'], ['a', 'v2']],
+                           'v': [['a', 'v2'], ['b', 'u2']], 'v2': [['ε', 'v'], ['b', 'u']]})
+        self.assertSameLanguage(guess, track)
+        self.assertEqual(str(guess.minimize()), str(track.minimize()))
+
+class TestAutomatonFile(unittest.TestCase):
+    def setUp(self):
+        folder = tempfile.TemporaryDirectory()
+        self.addCleanup(folder.cleanup)
+        self.path = os.path.join(folder.name, 'saved.lfab')
+
+    def test_automaton_round_trip(self):
+        rng = random.Random(3)
+        for _ in range(20):
+            fa = random_nfa(rng, rng.randint(1, 6))
+            fa.sigma[fa.Q[-1]] = fa.sigma.get(fa.Q[-1], [])
+            fa.save(self.path)
+            loaded = FiniteAutomaton().load(self.path)
+            for word in words('ab', 5):
+                self.assertEqual(loaded.accepts(word), fa.accepts(word), word)
+            self.assertEqual((loaded.Q, loaded.E, loaded.F, loaded.sigma), (fa.Q, fa.E, fa.F, fa.sigma))
+            loaded.close()
+
+    def test_automaton_close(self):
+        fa = automaton(['q0', 'q1'], ['a', 'b'], ['q1'], {'q0': [['a', 'q1'], ['ε', 'q1']], 'q1': [['b', 'q0']]})
+        fa.save(self.path)
+        loaded = FiniteAutomaton().load(self.path)
+        compiled = loaded.compile()
+        loaded.close()
+        # The mapping is gone, but the decoded automaton still works and compiles afresh
+        self.assertIsNone(compiled.file)
+        self.assertIsNot(loaded.compile(), compiled)
+        self.assertEqual(loaded.sigma, fa.sigma)
+        self.assertTrue(loaded.accepts('ab'))
+        with FiniteAutomaton().load(self.path).compile() as compiled:
+            self.assertTrue(compiled.accepts('aba'))
+        self.assertIsNone(compiled.file)
+
+    def test_grammar_round_trip(self):
+        g = grammar(['S', 'A'], ['a', 'b', 'ε'], {'S': ['aSb', 'A', ''], 'A': ['ε', 'ab']})
+        g.save(self.path)
+        loaded = Grammar().load(self.path)
+        self.assertEqual((loaded.VN, loaded.VT, loaded.P), (g.VN, g.VT, g.P))
+        for word in words('ab', 6):
+            self.assertEqual(Automata(loaded).check_string(word), Automata(g).check_string(word), word)
+        loaded.close()
+        self.assertEqual(loaded.P, g.P)
+
+    def test_grammar_is_lazy(self):
+        g = grammar(['S'], ['a'], {'S': ['aS', 'a']})
+        g.save(self.path)
+        loaded = Grammar().load(self.path)
+        # Nothing is decoded until it is read; the table itself holds views into the mapping
+        self.assertIsNone(loaded._P)
+        self.assertIsInstance(loaded._source.rhs, memoryview)
+        self.assertEqual(loaded._source.production(0), ('S', 'aS'))
+        with loaded._source as table:
+            self.assertEqual(table.productions(), g.P)
+        self.assertIsNone(table.file.mapping)
+
+class TestGenerate(unittest.TestCase):
+    def test_unreachable_unit_cycle(self):
+        # A -> A is never reached from S, so it must not stop exact-length sampling
+        automata = Automata(grammar(['S', 'A'], ['a', 'b'], {'S': ['aa'], 'A': ['aaS', 'b', 'A']}))
+        self.assertEqual(list(automata.generate(5, seed=1, length=2)), ['aa'] * 5)
+
+    def test_dead_unit_cycle(self):
+        # B only renames itself, so it derives nothing and takes part in no derivation
+        automata = Automata(grammar(['S', 'B'], ['a', 'b'], {'S': ['ab', 'aB', 'aSb'], 'B': ['B']}))
+        self.assertEqual(set(automata.generate(20, seed=1, length=4)), {'aabb'})
+
+    def test_live_unit_cycle(self):
+        # A reachable, productive unit cycle gives infinitely many derivations of one string
+        automata = Automata(grammar(['S', 'A'], ['a'], {'S': ['A'], 'A': ['S', 'a']}))
+        with self.assertRaises(ValueError):
+            list(automata.generate(1, seed=1, length=1))
+
+    def test_regular_grammar_uniform_over_strings(self):
+        # 'aa' has two derivations and 'ab' one, yet both strings are equally likely
+        automata = Automata(grammar(['S', 'A', 'B'], ['a', 'b'], {'S': ['aA', 'aB'], 'A': ['a', 'b'], 'B': ['a']}))
+        counts = Counter(automata.generate(4000, seed=1, length=2))
+        self.assertEqual(set(counts), {'aa', 'ab'})
+        self.assertLess(abs(counts['aa'] - counts['ab']), 300)
+
+    def test_context_free_grammar_uniform_over_derivations(self):
+        # S -> aA | Ab | ab with A -> a | b: 'ab' has three derivations, 'aa' and 'bb' one each
+        automata = Automata(grammar(['S', 'A'], ['a', 'b'], {'S': ['aA', 'Ab', 'ab'], 'A': ['a', 'b']}))
+        counts = Counter(automata.generate(5000, seed=1, length=2))
+        self.assertEqual(set(counts), {'aa', 'ab', 'bb'})
+        self.assertAlmostEqual(counts['ab'] / 5000, 0.6, delta=0.05)
+
+    def test_no_strings_of_length(self):
+        automata = Automata(grammar(['S'], ['a'], {'S': ['aa', 'aaS']}))
+        with self.assertRaises(ValueError):
+            list(automata.generate(1, seed=1, length=3))
+        self.assertEqual(list(automata.generate(2, seed=1, length=4)), ['aaaa'] * 2)
+
+    def test_non_productive_start(self):
+        automata = Automata(grammar(['S'], ['a'], {'S': ['aS']}))
+        with self.assertRaises(ValueError):
+            next(automata.generate(1, seed=1))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,24 +1,356 @@
 import random as rn
+from itertools import islice
+from typing import NamedTuple
 
 from .Grammar import Grammar
+from .FiniteAutomaton import FiniteAutomaton
+from .EarleyParser import EarleyParser
+
+class _GenerationTables(NamedTuple):
+    # Everything the generator derives from one version of a grammar
+    grammar: Grammar
+    version: int
+    rules: list  # (lhs, rhs tuple) pairs from the grammar analysis
+    by_lhs: dict  # Non-terminal -> indices of its rules
+    live: set  # Non-terminals both reachable from the start and productive
+    shortest: dict  # Non-terminal -> length of the shortest string it derives
+    longest: dict  # Non-terminal -> length of the longest one (None = unbounded)
+    bounds: dict  # (rule, k) -> (shortest, longest) length of the suffix rhs[k:]
+    counts: dict  # (symbol, size) and (rule, k, size) -> number of derivations
 
 class Automata:
     def __init__(self, grammar = Grammar()):
         self.grammar = grammar
+        self._compiled = None
+        self._rules = None
+        self._counted_length = -1  # Counts of every length up to this one are in _rules.counts
+        self._sampler = None  # Regular grammars: (automaton, its minimal DFA, string counts per length)
     
     def generating_strings(self):
+        rng = rn.Random()
         for i in range(5):
-            self.start = self.grammar.VN[0]
-            self.progression = "S"
-            while self.start[-1] not in self.grammar.VT:
-                temp = self.start[-1]
-                self.start = self.start[:-1]
-                self.start += rn.choice(self.grammar.P[temp])
-                self.progression += f"-> {self.start}"
-            print(f"\nProgression: \n{self.progression}")
-            print(f"Result: {self.start}")
-    
+            progression = [self.grammar.VN[0]]
+            result = self._random_derivation(rng, progression)
+            print(f"\nProgression: \n{'-> '.join(progression)}")
+            print(f"Result: {result}")
+
+    def generate(self, count=None, seed=None, length=None, max_steps=100000, max_attempts=1000):
+        # Yields `count` strings (endlessly when None) from a seeded RNG. With `length`, only
+        # strings of exactly that length come out: for a regular grammar every such string is
+        # equally likely (they are counted on its minimal DFA); for any other grammar every
+        # derivation is, which is uniform over derivations and over the strings themselves only
+        # when the grammar is unambiguous. Random derivations longer than max_steps are
+        # restarted at most max_attempts times.
+        rng = rn.Random(seed)
+        self._check_productive()
+        regular = length is not None and self._recognizer()[0] == "regular"
+        produced = 0
+        while count is None or produced < count:
+            if length is None:
+                result = self._random_derivation(rng, max_steps=max_steps, max_attempts=max_attempts)
+            elif regular:
+                result = self._uniform_string(rng, length)
+            else:
+                result = self._uniform_derivation(rng, length)
+            produced += 1
+            yield result
+
+    def _generation_rules(self):
+        grammar, version = self.grammar, self.grammar.version
+        if self._rules is None or self._rules.grammar is not grammar or self._rules.version != version:
+            analysis = grammar.analysis()
+            rules, by_lhs = analysis.rules, analysis.by_lhs
+            live = analysis.reachable & analysis.productive
+            shortest, longest, bounds = self._length_bounds(rules, by_lhs)
+            self._rules = _GenerationTables(grammar, version, rules, by_lhs, live, shortest, longest, bounds, {})
+            self._counted_length = -1
+        return self._rules
+
+    def _length_bounds(self, rules, by_lhs):
+        # Shortest and longest string each non-terminal derives (None = unbounded). Longest
+        # lengths settle within len(by_lhs) rounds unless they are unbounded, in which case
+        # they keep growing through the next len(by_lhs) rounds.
+        shortest = {}
+        longest = {}
+        unbounded = set()
+        rounds = len(by_lhs)
+        for current in range(2 * rounds + 2):
+            changed = False
+            for left, rhs in rules:
+                if all(s in shortest or s not in by_lhs for s in rhs):
+                    low = sum(shortest.get(s, 1) for s in rhs)
+                    if low < shortest.get(left, low + 1):
+                        shortest[left] = low
+                        changed = True
+                    high = sum(longest.get(s, 1) for s in rhs)
+                    if high > longest.get(left, -1):
+                        longest[left] = high
+                        changed = True
+                        if current > rounds:
+                            unbounded.add(left)
+            if not changed:
+                break
+        grew = True
+        while grew:
+            grew = False
+            for left, rhs in rules:
+                if left not in unbounded and any(s in unbounded for s in rhs) and left in longest:
+                    unbounded.add(left)
+                    grew = True
+        for left in unbounded:
+            longest[left] = None
+
+        # Bounds for every production suffix rhs[k:]
+        bounds = {}
+        for r, (left, rhs) in enumerate(rules):
+            low, high = 0, 0
+            bounds[(r, len(rhs))] = (low, high)
+            for k in range(len(rhs) - 1, -1, -1):
+                symbol = rhs[k]
+                if low is None:
+                    pass
+                elif symbol not in by_lhs:
+                    low, high = low + 1, None if high is None else high + 1
+                elif symbol not in shortest:
+                    low, high = None, None
+                else:
+                    low = low + shortest[symbol]
+                    high = None if high is None or longest[symbol] is None else high + longest[symbol]
+                bounds[(r, k)] = (low, high)
+        return shortest, longest, bounds
+
+    def _split_range(self, tables, symbol, r, k, size):
+        # Lengths m the non-terminal at rhs[k] may take when rhs[k:] spans `size` symbols
+        shortest, longest = tables.shortest, tables.longest
+        rest_low, rest_high = tables.bounds[(r, k + 1)]
+        if rest_low is None or symbol not in shortest:
+            return range(0)
+        low = shortest[symbol] if rest_high is None else max(shortest[symbol], size - rest_high)
+        high = size - rest_low if longest[symbol] is None else min(size - rest_low, longest[symbol])
+        return range(low, high + 1)
+
+    def _check_productive(self):
+        # A start symbol that derives no terminal string would make every derivation run forever
+        if not self.grammar.VN or self.grammar.VN[0] not in self.grammar.analysis().productive:
+            raise ValueError("The grammar generates no strings: its start symbol is not productive")
+
+    def _random_derivation(self, rng, progression=None, max_steps=100000, max_attempts=1000):
+        # Leftmost derivation over a stack of pending symbols, so each step costs O(|production|)
+        self._check_productive()
+        tables = self._generation_rules()
+        rules, by_lhs = tables.rules, tables.by_lhs
+        for _ in range(max_attempts):
+            output = []
+            stack = [self.grammar.VN[0]]
+            steps = 0
+            while stack and steps < max_steps:
+                symbol = stack.pop()
+                if symbol not in by_lhs:
+                    output.append(symbol)
+                    continue
+                stack.extend(reversed(rules[rng.choice(by_lhs[symbol])][1]))
+                steps += 1
+                if progression is not None:
+                    progression.append(''.join(output) + ''.join(reversed(stack)))
+            if not stack:
+                return ''.join(output)
+            if progression is not None:
+                del progression[1:]
+        raise ValueError(f"No derivation finished within {max_steps} steps in {max_attempts} attempts")
+
+    def _uniform_derivation(self, rng, length):
+        tables = self._generation_rules()
+        rules, by_lhs = tables.rules, tables.by_lhs
+        start = self.grammar.VN[0]
+        self._extend_counts(tables, length)
+        if self._count_symbol(tables, start, length) == 0:
+            raise ValueError(f"The grammar derives no strings of length {length}")
+
+        output = []
+        tasks = [(start, length)]
+        while tasks:
+            task = tasks.pop()
+            if len(task) == 2:
+                symbol, size = task
+                options = by_lhs[symbol]
+                weights = [self._count_sequence(tables, r, 0, size) for r in options]
+                tasks.append((options[self._weighted_index(rng, weights)], 0, size))
+                continue
+            r, k, size = task
+            rhs = rules[r][1]
+            if k == len(rhs):
+                continue
+            symbol = rhs[k]
+            if symbol not in by_lhs:
+                output.append(symbol)
+                tasks.append((r, k + 1, size - 1))
+                continue
+            splits = self._split_range(tables, symbol, r, k, size)
+            weights = [self._count_symbol(tables, symbol, m) * self._count_sequence(tables, r, k + 1, size - m) for m in splits]
+            m = splits[self._weighted_index(rng, weights)]
+            tasks.append((r, k + 1, size - m))
+            tasks.append((symbol, m))
+        return ''.join(output)
+
+    def _uniform_string(self, rng, length):
+        # Walks the minimal DFA of a regular grammar, picking each symbol with a weight equal to
+        # the number of accepted strings of the remaining length behind it
+        automaton = self._recognizer()[1]
+        if self._sampler is None or self._sampler[0] is not automaton:
+            self._sampler = (automaton, automaton.minimize().compile(), [])
+        _, dfa, counts = self._sampler
+        finals = set(dfa.finals)
+        while len(counts) <= length:
+            if not counts:
+                counts.append([1 if state in finals else 0 for state in range(len(dfa.states))])
+                continue
+            previous = counts[-1]
+            counts.append([sum(previous[dfa.targets[j]] for j in range(dfa.offsets[state], dfa.offsets[state + 1]))
+                           for state in range(len(dfa.states))])
+        if counts[length][0] == 0:
+            raise ValueError(f"The grammar derives no strings of length {length}")
+
+        output = []
+        state = 0
+        for remaining in range(length - 1, -1, -1):
+            moves = range(dfa.offsets[state], dfa.offsets[state + 1])
+            j = moves[self._weighted_index(rng, [counts[remaining][dfa.targets[j]] for j in moves])]
+            output.append(dfa.symbols[dfa.labels[j]])
+            state = dfa.targets[j]
+        return ''.join(output)
+
+    def _extend_counts(self, tables, length):
+        # Derivation counts are filled bottom-up by length, so lookups for shorter
+        # lengths are always cached and recursion only follows same-length chains. Only live
+        # non-terminals are counted: a unit cycle the start symbol never reaches, or one that
+        # derives nothing, takes part in no derivation and must not be reported.
+        for size in range(self._counted_length + 1, length + 1):
+            for symbol in tables.live:
+                self._count_symbol(tables, symbol, size, set())
+            self._counted_length = size
+
+    def _count_symbol(self, tables, symbol, size, active=None):
+        by_lhs, counts = tables.by_lhs, tables.counts
+        if symbol not in by_lhs:
+            return 1 if size == 1 else 0
+        key = (symbol, size)
+        if key not in counts:
+            active = set() if active is None else active
+            if symbol in active:
+                raise ValueError("Uniform sampling needs a grammar without ε or unit cycles")
+            active.add(symbol)
+            counts[key] = sum(self._count_sequence(tables, r, 0, size, active) for r in by_lhs[symbol])
+            active.discard(symbol)
+        return counts[key]
+
+    def _count_sequence(self, tables, r, k, size, active=None):
+        rules, by_lhs, counts = tables.rules, tables.by_lhs, tables.counts
+        key = (r, k, size)
+        if key not in counts:
+            rhs = rules[r][1]
+            if k == len(rhs):
+                total = 1 if size == 0 else 0
+            elif rhs[k] not in by_lhs:
+                total = self._count_sequence(tables, r, k + 1, size - 1, active) if size > 0 else 0
+            else:
+                total = 0
+                for m in self._split_range(tables, rhs[k], r, k, size):
+                    rest = self._count_sequence(tables, r, k + 1, size - m, active)
+                    if rest:
+                        total += self._count_symbol(tables, rhs[k], m, active) * rest
+            counts[key] = total
+        return counts[key]
+
+    def _weighted_index(self, rng, weights):
+        # Exact for arbitrarily large integer weights
+        point = rng.randrange(sum(weights))
+        for i, weight in enumerate(weights):
+            if point < weight:
+                return i
+            point -= weight
+
     def check_string(self, input_string):
+        kind, recognizer = self._recognizer()
+        if kind == "bounded":
+            return self._reverse_search(input_string)
+        return recognizer.accepts(input_string)
+
+    def check_strings(self, strings, chunk_size=65536):
+        # Bulk membership test; any iterable (generators included) is consumed chunk by chunk
+        import numpy as np
+
+        kind, recognizer = self._recognizer()
+        iterator = iter(strings)
+        results = []
+        while True:
+            chunk = list(islice(iterator, chunk_size))
+            if not chunk:
+                break
+            if kind == "regular":
+                results.append(self._check_chunk(recognizer, chunk))
+            else:
+                results.append(np.fromiter((self.check_string(s) for s in chunk), dtype=bool, count=len(chunk)))
+        if not results:
+            return np.zeros(0, dtype=bool)
+        return np.concatenate(results)
+
+    def _check_chunk(self, automaton, chunk):
+        import numpy as np
+
+        table, symbols, accepting = automaton.transition_matrix()
+        if any(len(symbol) != 1 for symbol in symbols):
+            raise ValueError("Batch matching needs single-character symbols")
+        unknown = len(symbols)
+
+        # Ragged encoding: every character of the chunk in one flat array of column indices
+        codes = np.array([ord(symbol) for symbol in symbols], dtype=np.uint32)
+        lookup = np.full(int(codes.max(initial=0)) + 2, unknown, dtype=np.int32)
+        lookup[codes] = np.arange(len(symbols), dtype=np.int32)
+        flat = np.frombuffer(''.join(chunk).encode('utf-32-le'), dtype=np.uint32)
+        columns = lookup[np.minimum(flat, len(lookup) - 1)]
+
+        # Longest strings first, so step i only touches the prefix of strings longer than i
+        lengths = np.fromiter(map(len, chunk), dtype=np.int64, count=len(chunk))
+        offsets = np.cumsum(lengths) - lengths
+        order = np.argsort(-lengths, kind='stable')
+        lengths, offsets = lengths[order], offsets[order]
+        flat_table = table.ravel()
+        width = table.shape[1]
+        states = np.zeros(len(chunk), dtype=np.int32)
+        active = len(chunk)
+        for i in range(int(lengths[0])):
+            while lengths[active - 1] <= i:
+                active -= 1
+            states[:active] = flat_table[states[:active] * width + columns[offsets[:active] + i]]
+
+        result = np.empty(len(chunk), dtype=bool)
+        result[order] = accepting[states]
+        return result
+
+    def derivation_forest(self, input_string):
+        # Packed parse forest of the string, or None when it is not in the language
+        kind, recognizer = self._recognizer()
+        if kind == "bounded":
+            raise ValueError("Derivation forests are only available for context-free grammars")
+        if kind == "regular":
+            recognizer = EarleyParser(self.grammar)
+        return recognizer.parse(input_string)
+
+    def _recognizer(self):
+        # The grammar is classified and compiled once per grammar version
+        grammar, version = self.grammar, self.grammar.version
+        if self._compiled is None or self._compiled[0] is not grammar or self._compiled[1] != version:
+            grammar_type = grammar.chomsky_check()
+            if grammar_type == "Type 3 (Regular)":
+                compiled = ("regular", FiniteAutomaton().from_grammar_to_automaton(grammar))
+            elif grammar_type == "Type 2 (Context-Free)":
+                compiled = ("context-free", EarleyParser(grammar))
+            else:
+                compiled = ("bounded", None)
+            self._compiled = (grammar, version, compiled)
+        return self._compiled[2]
+
+    def _reverse_search(self, input_string):
         current_strings = [input_string]
         steps = 0
         max_steps = 100
@@ -27,7 +359,6 @@ class Automata:
             next_strings = []
             for s in current_strings:
                 if s == self.grammar.VN[0]:
-                    print("String can be obtained from the grammar.")
                     return True
                 
                 for non_terminal, productions in self.grammar.P.items():
@@ -42,5 +373,4 @@ class Automata:
             current_strings = list(set(next_strings))
             steps += 1
 
-        print("String cannot be obtained from the grammar.")
-        return False
\ No newline at end of file
+        return False
@@ -0,0 +1,244 @@
+import mmap
+import struct
+from array import array
+
+from .CompiledAutomaton import CompiledAutomaton
+
+# File layout (little-endian, every section starts on an 8-byte boundary):
+#   header   magic b'LFAB', format version, kind, then the kind's counts
+#   kind 1   offsets int64[n + 1] | labels int32[m] | targets int32[m] | finals int32[f]
+#            | sigma bitmap (n bits) | state names | symbol names
+#   kind 2   VN ids int32 | VT ids int32 | lhs int32[p] | rhs offsets int64[p + 1]
+#            | rhs symbols int32[r] | symbol names
+# Name tables are int64 offsets[k + 1] followed by the concatenated UTF-8 bytes.
+MAGIC = b'LFAB'
+VERSION = 1
+AUTOMATON = 1
+GRAMMAR = 2
+HEADER = struct.Struct('<4sHH')
+AUTOMATON_COUNTS = struct.Struct('<QQQQ')
+GRAMMAR_COUNTS = struct.Struct('<QQQQQ')
+
+class NameTable:
+    # Read-only sequence of names decoded on access, so loading never touches every name
+    def __init__(self, offsets, blob):
+        self.offsets = offsets
+        self.blob = blob
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("name index out of range")
+        return str(self.blob[self.offsets[i]:self.offsets[i + 1]], 'utf-8')
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+def _pad(out):
+    out.write(b'\0' * (-out.tell() % 8))
+
+def _write_names(out, names):
+    encoded = [str(name).encode('utf-8') for name in names]
+    offsets = array('q', [0])
+    for name in encoded:
+        offsets.append(offsets[-1] + len(name))
+    _pad(out)
+    out.write(offsets.tobytes())
+    out.write(b''.join(encoded))
+
+def _write_array(out, values, typecode):
+    _pad(out)
+    out.write(array(typecode, values).tobytes())
+
+class MappedFile:
+    # A read-only mapping of a saved file plus every view handed out over it. close() releases
+    # the views and then the mapping; it can also be used as a context manager.
+    def __init__(self, path):
+        with open(path, 'rb') as source:
+            self.mapping = mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ)
+        self.view = memoryview(self.mapping)
+        self.views = []
+
+    def section(self, start, stop):
+        section = self.view[start:stop]
+        self.views.append(section)
+        return section
+
+    def cast(self, section, typecode):
+        section = section.cast(typecode)
+        self.views.append(section)
+        return section
+
+    def close(self):
+        if self.mapping is None:
+            return
+        for section in reversed(self.views):
+            section.release()
+        self.views.clear()
+        self.view.release()
+        self.mapping.close()
+        self.mapping = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+class _Reader:
+    # Hands out zero-copy typed views over consecutive sections of the mapped file
+    def __init__(self, mapped, position):
+        self.mapped = mapped
+        self.position = position
+
+    def take(self, typecode, count):
+        self.position += -self.position % 8
+        size = count * struct.calcsize(typecode)
+        section = self.mapped.section(self.position, self.position + size)
+        self.position += size
+        return self.mapped.cast(section, typecode)
+
+    def take_bytes(self, count):
+        section = self.mapped.section(self.position, self.position + count)
+        self.position += count
+        return section
+
+    def take_names(self, count):
+        offsets = self.take('q', count + 1)
+        return NameTable(offsets, self.take_bytes(offsets[-1] if count else 0))
+
+def _open(path, expected_kind):
+    mapped = MappedFile(path)
+    magic, version, kind = HEADER.unpack_from(mapped.view, 0)
+    if magic != MAGIC or version != VERSION or kind != expected_kind:
+        mapped.close()
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not an automaton file")
+    if version != VERSION:
+        raise ValueError(f"Unsupported automaton file version {version}")
+    if kind != expected_kind:
+        raise ValueError(f"{path} holds a different kind of object")
+    return mapped
+
+def save_automaton(compiled, path):
+    n, m = len(compiled.states), len(compiled.labels)
+    with open(path, 'wb') as out:
+        out.write(HEADER.pack(MAGIC, VERSION, AUTOMATON))
+        out.write(AUTOMATON_COUNTS.pack(n, len(compiled.symbols), compiled.alphabet_size, m))
+        out.write(struct.pack('<Q', len(compiled.finals)))
+        _write_array(out, compiled.offsets, 'q')
+        _write_array(out, compiled.labels, 'i')
+        _write_array(out, compiled.targets, 'i')
+        _write_array(out, compiled.finals, 'i')
+        _pad(out)
+        out.write(compiled.listed.to_bytes((n + 7) // 8, 'little'))
+        _write_names(out, compiled.states)
+        _write_names(out, compiled.symbols)
+
+def load_automaton(path):
+    # The transition arrays stay views into the shared read-only mapping, until close() on the
+    # returned CompiledAutomaton releases it
+    mapped = _open(path, AUTOMATON)
+    n, symbol_count, alphabet_size, m = AUTOMATON_COUNTS.unpack_from(mapped.view, HEADER.size)
+    final_count, = struct.unpack_from('<Q', mapped.view, HEADER.size + AUTOMATON_COUNTS.size)
+    reader = _Reader(mapped, HEADER.size + AUTOMATON_COUNTS.size + 8)
+    offsets = reader.take('q', n + 1)
+    labels = reader.take('i', m)
+    targets = reader.take('i', m)
+    finals = reader.take('i', final_count)
+    reader.position += -reader.position % 8
+    listed = int.from_bytes(reader.take_bytes((n + 7) // 8), 'little')
+    states = reader.take_names(n)
+    symbols = list(reader.take_names(symbol_count))
+    compiled = CompiledAutomaton(states, symbols, alphabet_size, offsets, labels, targets, finals, listed)
+    compiled.file = mapped
+    return compiled
+
+def save_grammar(grammar, path):
+    # Every symbol is interned once; a production is its left-hand id plus a run of right-hand
+    # ids taken character by character, so '' and 'ε' both survive the round trip
+    symbols = []
+    index = {}
+    def intern(symbol):
+        if symbol not in index:
+            index[symbol] = len(symbols)
+            symbols.append(symbol)
+        return index[symbol]
+
+    vn = array('i', [intern(symbol) for symbol in grammar.VN])
+    vt = array('i', [intern(symbol) for symbol in grammar.VT])
+    lhs = array('i')
+    rhs_offsets = array('q', [0])
+    rhs = array('i')
+    for left, rights in grammar.P.items():
+        for right in rights:
+            lhs.append(intern(left))
+            rhs.extend(intern(symbol) for symbol in right)
+            rhs_offsets.append(len(rhs))
+    with open(path, 'wb') as out:
+        out.write(HEADER.pack(MAGIC, VERSION, GRAMMAR))
+        out.write(GRAMMAR_COUNTS.pack(len(symbols), len(vn), len(vt), len(lhs), len(rhs)))
+        _write_array(out, vn, 'i')
+        _write_array(out, vt, 'i')
+        _write_array(out, lhs, 'i')
+        _write_array(out, rhs_offsets, 'q')
+        _write_array(out, rhs, 'i')
+        _write_names(out, symbols)
+
+class GrammarTable:
+    # A saved grammar as views into its mapped file: symbol ids for VN and VT, and each
+    # production as a left-hand id plus a run of right-hand ids. Names are decoded only on
+    # access, and nonterminals() / terminals() / productions() build the Grammar-level lists.
+    def __init__(self, symbols, vn, vt, lhs, rhs_offsets, rhs, file):
+        self.symbols = symbols
+        self.vn = vn
+        self.vt = vt
+        self.lhs = lhs
+        self.rhs_offsets = rhs_offsets
+        self.rhs = rhs
+        self.file = file
+
+    def nonterminals(self):
+        return [self.symbols[s] for s in self.vn]
+
+    def terminals(self):
+        return [self.symbols[s] for s in self.vt]
+
+    def production(self, p):
+        # (left-hand side, right-hand side) of production p
+        return self.symbols[self.lhs[p]], ''.join(self.symbols[s] for s in self.rhs[self.rhs_offsets[p]:self.rhs_offsets[p + 1]])
+
+    def productions(self):
+        P = {}
+        for p in range(len(self.lhs)):
+            left, right = self.production(p)
+            P.setdefault(left, []).append(right)
+        return P
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def load_grammar(path):
+    # Nothing is copied or decoded here: the returned GrammarTable reads the mapping directly
+    mapped = _open(path, GRAMMAR)
+    symbol_count, vn_count, vt_count, production_count, rhs_count = GRAMMAR_COUNTS.unpack_from(mapped.view, HEADER.size)
+    reader = _Reader(mapped, HEADER.size + GRAMMAR_COUNTS.size)
+    vn = reader.take('i', vn_count)
+    vt = reader.take('i', vt_count)
+    lhs = reader.take('i', production_count)
+    rhs_offsets = reader.take('q', production_count + 1)
+    rhs = reader.take('i', rhs_count)
+    return GrammarTable(reader.take_names(symbol_count), vn, vt, lhs, rhs_offsets, rhs, mapped)
@@ -0,0 +1,99 @@
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from .Grammar import Grammar
+from .Automata import Automata
+from .FiniteAutomaton import FiniteAutomaton
+
+# One job per JSONL line, e.g.
+#   {"id": 1, "op": "classify", "grammar": {"VN": [...], "VT": [...], "P": {...}}}
+#   {"id": 2, "op": "check_string", "strings": ["01", "0010"]}
+#   {"id": 3, "op": "ndfa_to_dfa", "automaton": {"Q": [...], "E": [...], "F": [...], "sigma": {...}}}
+# A missing grammar or automaton means the default one from Grammar / FiniteAutomaton.
+# Every job yields one line {"id": ..., "op": ..., "result": ...} or {"id": ..., "error": ...}.
+
+# Per-process caches keyed by the JSON of the payload, so a worker that sees the same grammar
+# or automaton in many jobs builds its recognizers and DFA tables only once
+_grammars = {}
+_automata = {}
+CACHE_LIMIT = 256
+
+def _cached(cache, payload, build):
+    key = json.dumps(payload, sort_keys=True)
+    if key not in cache:
+        if len(cache) >= CACHE_LIMIT:
+            cache.pop(next(iter(cache)))
+        cache[key] = build(payload)
+    return cache[key]
+
+def _build_automata(payload):
+    grammar = Grammar()
+    if payload is not None:
+        grammar.set_grammar(payload['VN'], payload['VT'], payload['P'])
+    return Automata(grammar)
+
+def _build_automaton(payload):
+    automaton = FiniteAutomaton()
+    if payload is not None:
+        automaton.set_automaton(payload['Q'], payload['E'], payload['F'], payload['sigma'])
+    return automaton
+
+def _automaton_dict(automaton):
+    return {'Q': automaton.Q, 'E': automaton.E, 'F': automaton.F, 'sigma': automaton.sigma}
+
+def _check(job, automata):
+    if 'strings' in job:
+        return [automata.check_string(s) for s in job['strings']]
+    return automata.check_string(job['string'])
+
+# op -> (what the job operates on, handler)
+OPERATIONS = {
+    'classify': ('grammar', lambda job, automata: automata.grammar.chomsky_check()),
+    'check_string': ('grammar', _check),
+    'generate': ('grammar', lambda job, automata: list(automata.generate(job.get('count', 5), job.get('seed'), job.get('length')))),
+    'grammar_to_fa': ('grammar', lambda job, automata: _automaton_dict(FiniteAutomaton().from_grammar_to_automaton(automata.grammar))),
+    'fa_to_grammar': ('automaton', lambda job, fa: fa.from_automaton_to_grammar()),
+    'fa_type': ('automaton', lambda job, fa: fa.is_dfa()),
+    'fa_accepts': ('automaton', lambda job, fa: fa.accepts(job['string'])),
+    'ndfa_to_dfa': ('automaton', lambda job, fa: _automaton_dict(fa.conversion_ndfa_to_dfa())),
+    'minimize': ('automaton', lambda job, fa: _automaton_dict(fa.minimize())),
+}
+
+def run_job(line):
+    # Takes and returns raw JSON text, so only short strings cross the process boundary
+    job_id = None
+    try:
+        job = json.loads(line)
+        job_id = job.get('id')
+        if job.get('op') not in OPERATIONS:
+            raise ValueError(f"Unknown operation {job.get('op')!r}")
+        kind, handler = OPERATIONS[job['op']]
+        if kind == 'grammar':
+            target = _cached(_grammars, job.get('grammar'), _build_automata)
+        else:
+            target = _cached(_automata, job.get('automaton'), _build_automaton)
+        return json.dumps({'id': job_id, 'op': job['op'], 'result': handler(job, target)}, ensure_ascii=False)
+    except Exception as error:
+        return json.dumps({'id': job_id, 'error': f"{type(error).__name__}: {error}"}, ensure_ascii=False)
+
+def run_batch(source=sys.stdin, out=sys.stdout, workers=None, chunksize=64):
+    # Jobs are read and dispatched a window at a time, so the input may be an endless pipe;
+    # results come back in input order. workers=0 runs everything in this process.
+    lines = (line for line in source if line.strip())
+    if workers == 0:
+        for line in lines:
+            out.write(run_job(line) + '\n')
+        return
+    workers = workers or os.cpu_count() or 1
+    window = chunksize * workers * 4
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        while True:
+            batch = list(islice(lines, window))
+            if not batch:
+                break
+            for result in pool.map(run_job, batch, chunksize=chunksize):
+                out.write(result + '\n')
+            out.flush()
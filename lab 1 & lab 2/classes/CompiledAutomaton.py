@@ -0,0 +1,218 @@
+from array import array
+
+class CompiledAutomaton:
+    # Dense integer form of a FiniteAutomaton. States and symbols are interned to ints and the
+    # transitions of state i are labels[j] / targets[j] for j in offsets[i]:offsets[i + 1] (CSR).
+    # The first alphabet_size symbols are E; later ones only appear in transitions (e.g. 'ε').
+    def __init__(self, states, symbols, alphabet_size, offsets, labels, targets, finals, listed):
+        self.states = states
+        self.symbols = symbols
+        self.alphabet_size = alphabet_size
+        self.offsets = offsets
+        self.labels = labels
+        self.targets = targets
+        # Final state ids in their original order, plus the same set as a bitmask
+        self.finals = finals
+        bits = bytearray((len(states) + 7) // 8)
+        for state in finals:
+            bits[state >> 3] |= 1 << (state & 7)
+        self.final_mask = int.from_bytes(bits, 'little')
+        # Bitmask of the states that have an entry in sigma, so empty lists survive a round trip
+        self.listed = listed
+        self.symbol_index = {symbol: i for i, symbol in enumerate(symbols)}
+        self.epsilon = self.symbol_index.get('ε', -1)
+        self._steps = None
+        self._epsilon_moves = None
+        # The MappedFile behind the arrays when loaded from disk
+        self.file = None
+
+    def close(self):
+        # Releases the mapping of a loaded automaton; the arrays are unusable afterwards
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def to_automaton(self):
+        from .FiniteAutomaton import FiniteAutomaton
+
+        automaton = FiniteAutomaton()
+        automaton.set_automaton(self.state_names(), self.alphabet(), self.final_names(), self.sigma())
+        return automaton
+
+    def state_names(self):
+        return list(self.states)
+
+    def alphabet(self):
+        return list(self.symbols[:self.alphabet_size])
+
+    def final_names(self):
+        return [self.states[i] for i in self.finals]
+
+    def sigma(self):
+        # Transitions decoded back to {state: [[symbol, next_state], ...]}
+        listed = self.listed.to_bytes((len(self.states) + 7) // 8, 'little')
+        sigma = {}
+        for i, state in enumerate(self.states):
+            if listed[i >> 3] >> (i & 7) & 1:
+                sigma[state] = [[self.symbols[self.labels[j]], self.states[self.targets[j]]] for j in range(self.offsets[i], self.offsets[i + 1])]
+        return sigma
+
+    def accepts(self, input_string):
+        # Walks the CSR rows directly, touching only the states on the current path; meant for
+        # automata loaded from disk, where building the lazy matcher's tables would defeat the
+        # point of a fast start
+        current = self.start_states()
+        for symbol in input_string:
+            label = self.symbol_index.get(symbol)
+            if label is None:
+                return False
+            current = self.successors(current, label)
+            if not current:
+                return False
+        return self.is_accepting(current)
+
+    def epsilon_moves(self):
+        # {state: [targets]} of the ε-transitions, built once; None when there are none
+        if self._epsilon_moves is None:
+            moves = {}
+            if self.epsilon >= 0:
+                for i in range(len(self.states)):
+                    for j in range(self.offsets[i], self.offsets[i + 1]):
+                        if self.labels[j] == self.epsilon:
+                            moves.setdefault(i, []).append(self.targets[j])
+            self._epsilon_moves = moves
+        return self._epsilon_moves or None
+
+    def closure(self, states):
+        # ε-closure of a set of state ids, as a frozenset
+        moves = self.epsilon_moves()
+        if moves is None:
+            return frozenset(states)
+        seen = set(states)
+        stack = list(seen)
+        while stack:
+            for j in moves.get(stack.pop(), ()):
+                if j not in seen:
+                    seen.add(j)
+                    stack.append(j)
+        return frozenset(seen)
+
+    def start_states(self):
+        return self.closure([0]) if self.states else frozenset()
+
+    def successors(self, states, label):
+        # ε-closed set reached from `states` on the symbol id `label`, read straight off the CSR rows
+        offsets, labels, targets = self.offsets, self.labels, self.targets
+        return self.closure([targets[j] for i in states for j in range(offsets[i], offsets[i + 1]) if labels[j] == label])
+
+    def is_accepting(self, states):
+        return any(self.final_mask >> i & 1 for i in states)
+
+    def is_dfa(self):
+        for i in range(len(self.states)):
+            labels = self.labels[self.offsets[i]:self.offsets[i + 1]]
+            if self.epsilon in labels or len(set(labels)) != len(labels):
+                return "NDFA"
+        return "DFA"
+
+    def from_automaton_to_grammar(self):
+        VN = ['A' + str(i) for i in range(len(self.states))]
+        VT = list(self.symbols[:self.alphabet_size])
+        productions = []
+        for i in range(len(self.states)):
+            for j in range(self.offsets[i], self.offsets[i + 1]):
+                productions.append(f"A{i} -> {self.symbols[self.labels[j]]}A{self.targets[j]}")
+        for state in self.finals:
+            productions.append(f"A{state} -> ε")
+        return f"Vn = {VN}\nVt = {VT} \n" + "\n".join(productions)
+
+    def epsilon_closures(self):
+        # ε-closure of every state as a bitmask
+        closures = [1 << i for i in range(len(self.states))]
+        moves = self.epsilon_moves()
+        if moves is None:
+            return closures
+        for i in moves:
+            stack = [i]
+            while stack:
+                for j in moves.get(stack.pop(), ()):
+                    if not closures[i] >> j & 1:
+                        closures[i] |= 1 << j
+                        stack.append(j)
+        return closures
+
+    def step_tables(self):
+        # Successors of whole bytes of a state bitmask: steps[symbol][byte][value] is the union of
+        # the ε-closed successors of the states whose bits are set in `value`. Only the full
+        # subset construction uses them: they cost O(states² · symbols) memory, so the lazy
+        # matcher of FiniteAutomaton steps through successors() instead.
+        if self._steps is None:
+            closures = self.epsilon_closures()
+            width = (len(self.states) + 7) // 8
+            successors = {}
+            for i in range(len(self.states)):
+                for j in range(self.offsets[i], self.offsets[i + 1]):
+                    if self.labels[j] != self.epsilon:
+                        row = successors.setdefault(self.labels[j], [0] * (width * 8))
+                        row[i] |= closures[self.targets[j]]
+            steps = {}
+            for symbol, row in successors.items():
+                byte_tables = []
+                for byte in range(width):
+                    table = [0] * 256
+                    for value in range(1, 256):
+                        low = value & -value
+                        table[value] = table[value ^ low] | row[byte * 8 + low.bit_length() - 1]
+                    byte_tables.append(table)
+                steps[symbol] = byte_tables
+            self._steps = (closures[0] if closures else 0, self.final_mask, width, steps)
+        return self._steps
+
+    def subset_construction(self, symbols):
+        # Worklist subset construction over the given symbol ids. A set of NFA states is an int
+        # bitmask and is interned through a dict, so membership checks are O(1).
+        start, final_mask, width, steps = self.step_tables()
+        empty = [[0] * 256 for _ in range(width)]
+        tables = [steps.get(symbol, empty) for symbol in symbols]
+        index = {start: 0}
+        masks = [start]
+        rows = []
+        while len(rows) < len(masks):
+            chunks = [(byte, value) for byte, value in enumerate(masks[len(rows)].to_bytes(width, 'little')) if value]
+            row = []
+            for byte_tables in tables:
+                target = 0
+                for byte, value in chunks:
+                    target |= byte_tables[byte][value]
+                if target not in index:
+                    index[target] = len(masks)
+                    masks.append(target)
+                row.append(index[target])
+            rows.append(row)
+        return masks, rows
+
+    def conversion_ndfa_to_dfa(self):
+        # Equivalent DFA named D0, D1, ... (D0 is the start); the empty subset is kept as an
+        # ordinary trap state when it is reachable
+        symbols = [i for i in range(self.alphabet_size) if i != self.epsilon]
+        masks, rows = self.subset_construction(symbols)
+        width = len(symbols)
+        targets = array('i')
+        for row in rows:
+            targets.extend(row)
+        return CompiledAutomaton(
+            [f"D{i}" for i in range(len(masks))],
+            [self.symbols[i] for i in symbols],
+            width,
+            array('q', (i * width for i in range(len(rows) + 1))),
+            array('i', range(width)) * len(rows),
+            targets,
+            array('i', [i for i, mask in enumerate(masks) if mask & self.final_mask]),
+            (1 << len(rows)) - 1
+        )
@@ -0,0 +1,131 @@
+class EarleyParser:
+    def __init__(self, grammar):
+        self.grammar = grammar
+        self._tables = None
+
+    def _compile(self):
+        # Prediction closures depend only on the grammar, so they are built once per grammar
+        # version on top of the grammar's shared analysis (rules and nullable set)
+        if self._tables is not None and self._tables[0] == self.grammar.version:
+            return self._tables[1]
+
+        analysis = self.grammar.analysis()
+        rules, by_lhs = analysis.rules, analysis.by_lhs
+        nonterminals, nullable = analysis.nonterminals, analysis.nullable
+
+        # skip[r][d]: dots reachable from d by stepping over nullable symbols (Aycock-Horspool)
+        skip = []
+        for left, rhs in rules:
+            dots = [[d] for d in range(len(rhs) + 1)]
+            for d in range(len(rhs) - 1, -1, -1):
+                if rhs[d] in nullable:
+                    dots[d] = [d] + dots[d + 1]
+            skip.append(dots)
+
+        # predict[A]: every (rule, dot) that enters the chart when A is predicted
+        predict = {}
+        for symbol in nonterminals:
+            items = set()
+            stack = [symbol]
+            seen = {symbol}
+            while stack:
+                current = stack.pop()
+                for r in by_lhs.get(current, ()):
+                    rhs = rules[r][1]
+                    for d in skip[r][0]:
+                        items.add((r, d))
+                        if d < len(rhs) and rhs[d] in nonterminals and rhs[d] not in seen:
+                            seen.add(rhs[d])
+                            stack.append(rhs[d])
+            predict[symbol] = tuple(items)
+
+        tables = (rules, nonterminals, skip, predict, by_lhs)
+        self._tables = (self.grammar.version, tables)
+        return tables
+
+    def _chart(self, input_string):
+        rules, nonterminals, skip, predict = self._compile()[:4]
+        n = len(input_string)
+        chart = [set() for _ in range(n + 1)]
+        waiting = [{} for _ in range(n + 1)]
+        chart[0].update((r, d, 0) for r, d in predict.get(self.grammar.VN[0], ()))
+
+        for j in range(n + 1):
+            agenda = list(chart[j])
+            current = chart[j]
+            while agenda:
+                r, d, origin = agenda.pop()
+                left, rhs = rules[r]
+                if d == len(rhs):
+                    # Completion: advance everything at the origin that waits for `left`
+                    for r2, d2, o2 in waiting[origin].get(left, ()):
+                        for d3 in skip[r2][d2 + 1]:
+                            item = (r2, d3, o2)
+                            if item not in current:
+                                current.add(item)
+                                agenda.append(item)
+                    continue
+
+                symbol = rhs[d]
+                if symbol in nonterminals:
+                    waiting[j].setdefault(symbol, []).append((r, d, origin))
+                    for r2, d2 in predict[symbol]:
+                        item = (r2, d2, j)
+                        if item not in current:
+                            current.add(item)
+                            agenda.append(item)
+                elif j < n and input_string[j] == symbol:
+                    chart[j + 1].update((r, d3, origin) for d3 in skip[r][d + 1])
+        return chart
+
+    def accepts(self, input_string):
+        rules = self._compile()[0]
+        start = self.grammar.VN[0]
+        chart = self._chart(input_string)
+        return any(origin == 0 and d == len(rules[r][1]) and rules[r][0] == start for r, d, origin in chart[-1])
+
+    def parse(self, input_string):
+        # Returns (root, forest) where forest maps (A, i, j) to its packed alternatives,
+        # each one a (production, children) pair; children are terminals or (B, k, m) nodes
+        rules, nonterminals, _, _, by_lhs = self._compile()
+        chart = self._chart(input_string)
+        ends = {}
+        for j, items in enumerate(chart):
+            for r, d, origin in items:
+                if d == len(rules[r][1]):
+                    ends.setdefault((rules[r][0], origin), set()).add(j)
+
+        root = (self.grammar.VN[0], 0, len(input_string))
+        if root[2] not in ends.get(root[:2], ()):
+            return None
+
+        def splits(rhs, k, i, j):
+            if k == len(rhs):
+                if i == j:
+                    yield ()
+                return
+            symbol = rhs[k]
+            if symbol in nonterminals:
+                for m in ends.get((symbol, i), ()):
+                    if m <= j:
+                        for rest in splits(rhs, k + 1, m, j):
+                            yield ((symbol, i, m),) + rest
+            elif i < j and input_string[i] == symbol:
+                for rest in splits(rhs, k + 1, i + 1, j):
+                    yield (symbol,) + rest
+
+        forest = {}
+        pending = [root]
+        while pending:
+            node = pending.pop()
+            if node in forest:
+                continue
+            left, i, j = node
+            alternatives = []
+            for r in by_lhs.get(left, ()):
+                rhs = rules[r][1]
+                for children in splits(rhs, 0, i, j):
+                    alternatives.append((''.join(rhs) or 'ε', children))
+                    pending.extend(child for child in children if isinstance(child, tuple) and child not in forest)
+            forest[node] = alternatives
+        return root, forest
@@ -1,9 +1,14 @@
-import networkx as nx
-import matplotlib.pyplot as plt
-import numpy as np
+from array import array
+from collections import OrderedDict
+
+from .CompiledAutomaton import CompiledAutomaton
+from .AutomatonFile import save_automaton, load_automaton
+from .GraphExport import write_dot, write_svg
 
 class FiniteAutomaton:
     def __init__(self):
+        # Set by load(): Q, E, F and sigma are decoded from this compiled form on first access
+        self._source = None
         self.Q = ['q0','q1','q2']
         self.E = ['a','b']
         self.F = ['q2']
@@ -12,85 +17,356 @@ class FiniteAutomaton:
             'q1': [['b','q1'],['b','q2'],['a','q0']],
             'q2': [['b','q1']]
         }
+        self._matrix = None
+        self._compiled = None
+        self._lazy_states = OrderedDict()
+        self.max_cached_states = 10000
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.cache_evictions = 0
     
     def set_automaton(self, Q, E, F, sigma):
         self.Q = Q
         self.E = E
         self.F = F
         self.sigma = sigma
+        self._source = None
+        self._matrix = None
+        self._compiled = None
+        self._lazy_states.clear()
+
+    @property
+    def Q(self):
+        if self._Q is None:
+            self._Q = self._source.state_names()
+        return self._Q
+
+    @Q.setter
+    def Q(self, Q):
+        self._Q = Q
+
+    @property
+    def E(self):
+        if self._E is None:
+            self._E = self._source.alphabet()
+        return self._E
+
+    @E.setter
+    def E(self, E):
+        self._E = E
+
+    @property
+    def F(self):
+        if self._F is None:
+            self._F = self._source.final_names()
+        return self._F
+
+    @F.setter
+    def F(self, F):
+        self._F = F
+
+    @property
+    def sigma(self):
+        if self._sigma is None:
+            self._sigma = self._source.sigma()
+        return self._sigma
+
+    @sigma.setter
+    def sigma(self, sigma):
+        self._sigma = sigma
+
+    def compile(self):
+        # Integer form used by every algorithm below; rebuilt only after set_automaton
+        if self._compiled is None:
+            states = list(self.Q)
+            position = {state: i for i, state in enumerate(states)}
+            symbols = list(self.E)
+            symbol_index = {}
+            for i, symbol in enumerate(symbols):
+                symbol_index.setdefault(symbol, i)
+            offsets = array('q', [0])
+            labels = array('i')
+            targets = array('i')
+            listed = bytearray((len(states) + 7) // 8)
+            for i, state in enumerate(states):
+                if state in self.sigma:
+                    listed[i >> 3] |= 1 << (i & 7)
+                    for symbol, next_state in self.sigma[state]:
+                        if symbol not in symbol_index:
+                            symbol_index[symbol] = len(symbols)
+                            symbols.append(symbol)
+                        if next_state not in position:
+                            raise ValueError(f"Transition from {state} leads to unknown state {next_state}")
+                        labels.append(symbol_index[symbol])
+                        targets.append(position[next_state])
+                offsets.append(len(labels))
+            unknown = [state for state in self.sigma if state not in position]
+            if unknown:
+                raise ValueError(f"Transitions given for unknown states {unknown}")
+            finals = array('i', [position[state] for state in self.F if state in position])
+            self._compiled = CompiledAutomaton(states, symbols, len(self.E), offsets, labels, targets, finals, int.from_bytes(listed, 'little'))
+        return self._compiled
+
+    def save(self, path):
+        save_automaton(self.compile(), path)
+
+    def load(self, path):
+        # The compiled form stays backed by the memory-mapped file and every algorithm runs on
+        # it directly; Q, E, F and sigma are only decoded if something reads them
+        if self._source is not None:
+            self._source.close()
+        self.set_automaton(None, None, None, None)
+        self._source = self._compiled = load_automaton(path)
+        return self
+
+    def close(self):
+        # Decodes whatever is still lazy and unmaps the loaded file; the automaton stays usable
+        # and compiles again from Q, E, F and sigma when needed
+        if self._source is not None:
+            source = self._source
+            self.set_automaton(self.Q, self.E, self.F, self.sigma)
+            source.close()
 
     def from_automaton_to_grammar(self):
-        self.VN = ['A'+str(i) for i in range(len(self.Q))]
-        self.VT = self.E.copy()
-        productions = []
-        for state, transitions in self.sigma.items():
-            index = self.Q.index(state)
-            for transition in transitions:
-                if len(transition) == 2:
-                    letter, final_state = transition
-                    productions.append(f"A{index} -> {letter}A{self.Q.index(final_state)}")
+        compiled = self.compile()
+        self.VN = ['A'+str(i) for i in range(len(compiled.states))]
+        self.VT = compiled.alphabet()
+        return compiled.from_automaton_to_grammar()
 
-        for accept_state in self.F:
-            productions.append(f"A{accept_state[1]} -> ε")
+    def from_grammar_to_automaton(self, grammar):
+        # Right-linear productions: A -> aB becomes A --a--> B, A -> a leads to the extra final state
+        final_state = 'qF'
+        while final_state in grammar.VN:
+            final_state += "'"
+        F = [final_state]
+        sigma = {}
+        for left, rights in grammar.P.items():
+            for right in rights:
+                if right in ('', 'ε'):
+                    if left not in F:
+                        F.append(left)
+                elif len(right) == 1:
+                    sigma.setdefault(left, []).append([right, final_state])
+                else:
+                    sigma.setdefault(left, []).append([right[0], right[1]])
+        self.set_automaton(list(grammar.VN) + [final_state], list(grammar.VT), F, sigma)
+        return self
+
+    def accepts(self, input_string):
+        # Simulates the NFA while determinizing on the fly: each DFA state (a frozenset of NFA
+        # states) and its transitions are computed from the CSR rows only when the input reaches
+        # it, and kept in an LRU cache of at most max_cached_states entries, so memory stays
+        # bounded however large the full DFA would be
+        compiled = self.compile()
+        symbol_index = compiled.symbol_index
+        cache = self._lazy_states
+        state = compiled.start_states()
+        for symbol in input_string:
+            transitions = cache.get(state)
+            if transitions is None:
+                transitions = cache[state] = {}
+                while len(cache) > self.max_cached_states:
+                    cache.popitem(last=False)
+                    self.cache_evictions += 1
+            else:
+                cache.move_to_end(state)
+            target = transitions.get(symbol)
+            if target is None:
+                self.cache_misses += 1
+                label = symbol_index.get(symbol)
+                if label is None:
+                    return False
+                target = transitions[symbol] = compiled.successors(state, label)
+            else:
+                self.cache_hits += 1
+            if not target:
+                return False
+            state = target
+        return compiled.is_accepting(state)
+
+    def set_cache_limit(self, max_cached_states):
+        self.max_cached_states = max_cached_states
+        while len(self._lazy_states) > max_cached_states:
+            self._lazy_states.popitem(last=False)
+            self.cache_evictions += 1
+
+    def cache_stats(self):
+        lookups = self.cache_hits + self.cache_misses
+        return {
+            "states": len(self._lazy_states),
+            "hits": self.cache_hits,
+            "misses": self.cache_misses,
+            "evictions": self.cache_evictions,
+            "hit_rate": self.cache_hits / lookups if lookups else 0.0
+        }
 
-        return f"Vn = {self.VN}\nVt = {self.VT} \n" + "\n".join(productions)
+    def transition_matrix(self):
+        # Complete DFA as an integer table for batch matching: rows are DFA states (row 0 is the
+        # start, the last row is the dead state), columns follow the symbols sorted by code point
+        # plus one trailing column for symbols outside the alphabet
+        if self._matrix is None:
+            import numpy as np
+
+            compiled = self.compile()
+            symbols = sorted(symbol for symbol in compiled.alphabet() if symbol != 'ε')
+            masks, rows = compiled.subset_construction([compiled.symbol_index[symbol] for symbol in symbols])
+            dead = len(rows)
+            rows = [row + [dead] for row in rows] + [[dead] * (len(symbols) + 1)]
+            table = np.array(rows, dtype=np.int32).reshape(len(rows), len(symbols) + 1)
+            accepting = np.array([bool(mask & compiled.final_mask) for mask in masks] + [False], dtype=bool)
+            self._matrix = (table, symbols, accepting)
+        return self._matrix
 
     def is_dfa(self):
+        return self.compile().is_dfa()
+
+    def conversion_ndfa_to_dfa(self):
+        # Returns an equivalent DFA named D0, D1, ... (D0 is the start); the empty subset is kept
+        # as an ordinary trap state when it is reachable, like in the original construction
+        return self.compile().conversion_ndfa_to_dfa().to_automaton()
+
+    def minimize(self):
+        # Hopcroft partition refinement. Unreachable states are dropped and dead states are merged
+        # into an implicit sink before refining; the sink is removed again at the end. States are
+        # renumbered q0, q1, ... in breadth-first order over the sorted alphabet, so equivalent
+        # automata always minimize to identical objects.
+        dfa = self.compile()
+        if dfa.is_dfa() == "NDFA":
+            dfa = dfa.conversion_ndfa_to_dfa()
+        symbols = sorted(symbol for symbol in dfa.symbols[:dfa.alphabet_size] if symbol != 'ε')
+        column = {dfa.symbol_index[symbol]: c for c, symbol in enumerate(symbols)}
+        sink = len(dfa.states)
+        delta = [[sink] * len(symbols) for _ in range(sink + 1)]
+        for i in range(sink):
+            for j in range(dfa.offsets[i], dfa.offsets[i + 1]):
+                if dfa.labels[j] in column:
+                    delta[i][column[dfa.labels[j]]] = dfa.targets[j]
+
+        reachable = {0}
+        stack = [0]
+        while stack:
+            for target in delta[stack.pop()]:
+                if target not in reachable:
+                    reachable.add(target)
+                    stack.append(target)
+        reverse = {}
+        for state in reachable:
+            for target in delta[state]:
+                reverse.setdefault(target, []).append(state)
+        live = {state for state in dfa.finals if state in reachable}
+        stack = list(live)
+        while stack:
+            for source in reverse.get(stack.pop(), ()):
+                if source not in live:
+                    live.add(source)
+                    stack.append(source)
+
+        minimal = FiniteAutomaton()
+        if 0 not in live:
+            minimal.set_automaton(['q0'], symbols, [], {})
+            return minimal
+
+        # Dead states all behave like the sink, so they are redirected to it up front
+        states = sorted(live) + [sink]
+        for state in states:
+            delta[state] = [target if target in live else sink for target in delta[state]]
+        inverse = [{} for _ in symbols]
+        for state in states:
+            for c, target in enumerate(delta[state]):
+                inverse[c].setdefault(target, []).append(state)
+
+        final = set(dfa.finals) & live
+        blocks = [block for block in (set(final), set(states) - final) if block]
+        block_of = {}
+        for b, block in enumerate(blocks):
+            for state in block:
+                block_of[state] = b
+        smaller = min(range(len(blocks)), key=lambda b: len(blocks[b]))
+        waiting = [(smaller, c) for c in range(len(symbols))]
+        in_waiting = set(waiting)
+        while waiting:
+            splitter = waiting.pop()
+            in_waiting.discard(splitter)
+            b, c = splitter
+            touched = {}
+            for state in blocks[b]:
+                for source in inverse[c].get(state, ()):
+                    touched.setdefault(block_of[source], []).append(source)
+            for y, inside in touched.items():
+                if len(inside) == len(blocks[y]):
+                    continue
+                new = len(blocks)
+                blocks.append(set(inside))
+                blocks[y].difference_update(inside)
+                for state in inside:
+                    block_of[state] = new
+                for d in range(len(symbols)):
+                    if (y, d) in in_waiting:
+                        pending = (new, d)
+                    else:
+                        pending = (new, d) if len(blocks[new]) <= len(blocks[y]) else (y, d)
+                    waiting.append(pending)
+                    in_waiting.add(pending)
+
+        # Canonical breadth-first numbering that skips the sink block
+        dead_block = block_of[sink]
+        number = {block_of[0]: 0}
+        order = [block_of[0]]
+        sigma = {}
+        for b in order:
+            representative = next(iter(blocks[b]))
+            transitions = []
+            for c, symbol in enumerate(symbols):
+                target = block_of[delta[representative][c]]
+                if target == dead_block:
+                    continue
+                if target not in number:
+                    number[target] = len(order)
+                    order.append(target)
+                transitions.append([symbol, f"q{number[target]}"])
+            if transitions:
+                sigma[f"q{number[b]}"] = transitions
+        names = [f"q{i}" for i in range(len(order))]
+        minimal.set_automaton(names, symbols, [f"q{number[b]}" for b in order if next(iter(blocks[b])) in final], sigma)
+        return minimal
+
+    def draw(self, path=None):
+        # An NFA can have several targets on one symbol, so every symbol maps to a list
+        transitions = {}
         for state in self.Q:
-            transitions_for_state = self.sigma.get(state, [])
-            symbols_seen = set()
+            transitions[state] = {}
+            for symbol, next_state in self.sigma.get(state, []):
+                transitions[state].setdefault(symbol, []).append(next_state)
+        self.draw_dfa(transitions, self.F, path)
 
-            for transition in transitions_for_state:
-                symbol = transition[0]
+    def export_dot(self, out):
+        write_dot(self.compile(), out)
 
-                if symbol == "ε" or symbol in symbols_seen:
-                    return "NDFA"
-                symbols_seen.add(symbol)
-        return "DFA"
+    def export_svg(self, out):
+        write_svg(self.compile(), out)
+
+    def __str__(self):
+        return f"Q = {self.Q}\nE = {self.E}\nF = {self.F}\nsigma = {self.sigma}"
+
+    def draw_dfa(self, dfa_transitions_named, dfa_final_states_names, path=None):
+        # The plotting stack is only imported when something is actually drawn
+        import networkx as nx
+        import matplotlib.pyplot as plt
+        import numpy as np
 
-    def conversion_ndfa_to_dfa(self):
-            if self.is_dfa() == "DFA":
-                return "No need to convert. FA is already a DFA"
-            
-            dfa_states = [frozenset([self.Q[0]])]
-            dfa_transitions = {}
-            dfa_final_states = set()
-
-            while len(dfa_states) > len(dfa_transitions):
-                for state_set in dfa_states:
-                    if state_set not in dfa_transitions:
-                        dfa_transitions[state_set] = {}
-                        for symbol in self.E:
-                            next_state = frozenset(sum([self._get_next_states(s, symbol) for s in state_set], []))
-                            if next_state not in dfa_states:
-                                dfa_states.append(next_state)
-                            dfa_transitions[state_set][symbol] = next_state
-
-                            if not dfa_final_states.intersection(state_set) and any(s in self.F for s in state_set):
-                                dfa_final_states.add(state_set)
-
-            # Convert frozensets to more readable state names
-            state_names = {state: f"D{index}" for index, state in enumerate(dfa_states)}
-            dfa_final_states_names = [state_names[state] for state in dfa_final_states]
-
-            # Convert transitions to use the new state names
-            dfa_transitions_named = {state_names[state]: {symbol: state_names[next_state] for symbol, next_state in transitions.items()} for state, transitions in dfa_transitions.items()}
-            self.draw_dfa(dfa_transitions_named, dfa_final_states_names)
-            return f"Transitions in the form [State: [transition : state]]:{dfa_transitions_named}\nFinal state : {dfa_final_states_names}"
-
-    def _get_next_states(self, current_state, symbol):
-        return [transition[1] for transition in self.sigma.get(current_state, []) if transition[0] == symbol]
-    
-    def draw_dfa(self, dfa_transitions_named, dfa_final_states_names):
         G = nx.DiGraph()
         # Add nodes with their labels
         for state in dfa_transitions_named:
             G.add_node(state)
         
-        # Add edges with their labels
+        # Add edges with their labels; symbols sharing an edge are listed together
         for state, transitions in dfa_transitions_named.items():
-            for symbol, next_state in transitions.items():
-                G.add_edge(state, next_state, label=symbol)
+            for symbol, next_states in transitions.items():
+                for next_state in next_states:
+                    if G.has_edge(state, next_state):
+                        G[state][next_state]['label'] += ',' + symbol
+                    else:
+                        G.add_edge(state, next_state, label=symbol)
         
         pos = nx.circular_layout(G)  # Using circular layout for clearer structure
         
@@ -100,19 +376,18 @@ class FiniteAutomaton:
         edges = nx.draw_networkx_edges(G, pos, arrowstyle='->', arrowsize=20, connectionstyle='arc3,rad=0.2')
         
         # Handle self-loops after drawing other edges to avoid overlap issues
-        for state, transitions in dfa_transitions_named.items():
-            for symbol, next_state in transitions.items():
-                if state == next_state:  # Identify self-loops
-                    loop_pos = np.array(pos[state])
-                    # Drawing self-loop with an arc away from the node
-                    plt.annotate("", xy=loop_pos, xycoords='data',
-                                 xytext=loop_pos + np.array([0, 0.4]), textcoords='data',
-                                 arrowprops=dict(arrowstyle="->", color="red",
-                                                 shrinkA=15, shrinkB=15,
-                                                 patchA=None, patchB=None,
-                                                 connectionstyle="arc3,rad=0.3"))
-                    # Placing text for self-loop
-                    plt.text(loop_pos[0], loop_pos[1] + 0.5, symbol, ha='center', color="red")
+        for state in dfa_transitions_named:
+            if G.has_edge(state, state):  # Identify self-loops
+                loop_pos = np.array(pos[state])
+                # Drawing self-loop with an arc away from the node
+                plt.annotate("", xy=loop_pos, xycoords='data',
+                             xytext=loop_pos + np.array([0, 0.4]), textcoords='data',
+                             arrowprops=dict(arrowstyle="->", color="red",
+                                             shrinkA=15, shrinkB=15,
+                                             patchA=None, patchB=None,
+                                             connectionstyle="arc3,rad=0.3"))
+                # Placing text for self-loop
+                plt.text(loop_pos[0], loop_pos[1] + 0.5, G[state][state]['label'], ha='center', color="red")
         
         # Highlight final states
         nx.draw_networkx_nodes(G, pos, nodelist=dfa_final_states_names, node_color='lightgreen', edgecolors='black')
@@ -123,4 +398,9 @@ class FiniteAutomaton:
         
         plt.title('DFA Visualization')
         plt.axis('off')
-        plt.show()
\ No newline at end of file
+        # Saving to a file instead of opening a window keeps batch runs from blocking
+        if path is None:
+            plt.show()
+        else:
+            plt.savefig(path)
+            plt.close()
\ No newline at end of file
@@ -1,5 +1,10 @@
+from .GrammarAnalysis import GrammarAnalysis
+from .AutomatonFile import save_grammar, load_grammar
+
 class Grammar:
     def __init__(self):
+        # Set by load(): VN, VT and P are decoded from this mapped table on first access
+        self._source = None
         # # Type 2 grammar
         # self.VN = ['S', 'B', 'C']
         # self.VT = ['a', 'b', 'c']
@@ -16,32 +21,98 @@ class Grammar:
             'A': ['1B', '0'],
             'B': ['0A', '1']
         }
+        # Bumped on every change so compiled recognizers know when to rebuild
+        self.version = 0
+        self._analysis = None
 
     def set_grammar(self, VN, VT, P):
         self.VN = VN
         self.VT = VT
         self.P = P
+        self._source = None
+        self.version += 1
+        self._analysis = None
+
+    @property
+    def VN(self):
+        if self._VN is None:
+            self._VN = self._source.nonterminals()
+        return self._VN
+
+    @VN.setter
+    def VN(self, VN):
+        self._VN = VN
+
+    @property
+    def VT(self):
+        if self._VT is None:
+            self._VT = self._source.terminals()
+        return self._VT
+
+    @VT.setter
+    def VT(self, VT):
+        self._VT = VT
+
+    @property
+    def P(self):
+        if self._P is None:
+            self._P = self._source.productions()
+        return self._P
+
+    @P.setter
+    def P(self, P):
+        self._P = P
+
+    def save(self, path):
+        save_grammar(self, path)
+
+    def load(self, path):
+        # The file stays mapped and VN, VT and P are only decoded if something reads them
+        if self._source is not None:
+            self._source.close()
+        self.set_grammar(None, None, None)
+        self._source = load_grammar(path)
+        return self
+
+    def close(self):
+        # Decodes whatever is still lazy and unmaps the loaded file
+        if self._source is not None:
+            source = self._source
+            VN, VT, P = self.VN, self.VT, self.P
+            self._source = None
+            self.VN, self.VT, self.P = VN, VT, P
+            source.close()
+
+    def analysis(self):
+        # Shared by the classifier, the recognizers and the generator; rebuilt only after a change
+        if self._analysis is None or self._analysis.version != self.version:
+            self._analysis = GrammarAnalysis(self)
+        return self._analysis
 
     def chomsky_check(self):
+        analysis = self.analysis()
+        if analysis.grammar_type is not None:
+            return analysis.grammar_type
         is_type_3 = True
         is_type_2 = True
 
         for left, rights in self.P.items():
             # Type 2 checks: Left side must be a single non-terminal.
-            if len(left) != 1 or left not in self.VN:
+            if len(left) != 1 or left not in analysis.VN:
                 is_type_2 = False
 
             for right in rights:
-                if len(right) > 2 or (len(right) == 2 and not(right[0] in self.VT and right[1] in self.VN)):
+                if len(right) > 2 or (len(right) == 2 and not(right[0] in analysis.VT and right[1] in analysis.VN)):
                     is_type_3 = False
-                if len(right) == 1 and right not in self.VT:
+                if len(right) == 1 and right not in analysis.VT:
                     is_type_3 = False
                 if right == '':
                     is_type_3 = False 
 
         if is_type_3:
-            return "Type 3 (Regular)"
+            analysis.grammar_type = "Type 3 (Regular)"
         elif is_type_2:
-            return "Type 2 (Context-Free)"
+            analysis.grammar_type = "Type 2 (Context-Free)"
         else:
-            return "Type 1 (Context-Sensitive)"
\ No newline at end of file
+            analysis.grammar_type = "Type 1 (Context-Sensitive)"
+        return analysis.grammar_type
\ No newline at end of file
@@ -0,0 +1,136 @@
+class GrammarAnalysis:
+    # Everything derived from one version of a Grammar: the productions as (lhs, rhs tuple)
+    # rules, the nullable / productive / reachable non-terminals and the FIRST / FOLLOW sets.
+    # Each set is a worklist fixpoint that touches every rule occurrence a bounded number of
+    # times, so one analysis costs a single pass over the grammar instead of repeated rescans.
+    END = '$'
+
+    def __init__(self, grammar):
+        self.version = grammar.version
+        self.start = grammar.VN[0] if grammar.VN else None
+        self.VN = set(grammar.VN)
+        self.VT = set(grammar.VT)
+        self.nonterminals = self.VN | set(grammar.P)
+        self.rules = []
+        self.by_lhs = {}
+        for left, rights in grammar.P.items():
+            for right in rights:
+                self.by_lhs.setdefault(left, []).append(len(self.rules))
+                self.rules.append((left, () if right in ('', 'ε') else tuple(right)))
+
+        # occurrences[X]: rule indices with X on the right-hand side, once per occurrence
+        self.occurrences = {}
+        for r, (left, rhs) in enumerate(self.rules):
+            for symbol in rhs:
+                if symbol in self.nonterminals:
+                    self.occurrences.setdefault(symbol, []).append(r)
+
+        self.nullable = self._closure(True)
+        self.productive = self._closure(False)
+        self.reachable = self._reachable()
+        self.first = self._first()
+        self.follow = self._follow()
+        self.grammar_type = None
+
+    def _closure(self, terminals_block):
+        # Left-hand sides with a rule whose non-terminals are all in the set. Each rule keeps a
+        # counter of the non-terminal occurrences still missing and fires once it hits zero;
+        # for nullable, a rule containing a terminal starts below zero and never fires.
+        remaining = []
+        for _, rhs in self.rules:
+            count = sum(1 for symbol in rhs if symbol in self.nonterminals)
+            remaining.append(-1 if terminals_block and count < len(rhs) else count)
+        found = set()
+        stack = []
+        for r, (left, _) in enumerate(self.rules):
+            if remaining[r] == 0 and left not in found:
+                found.add(left)
+                stack.append(left)
+        while stack:
+            for r in self.occurrences.get(stack.pop(), ()):
+                remaining[r] -= 1
+                left = self.rules[r][0]
+                if remaining[r] == 0 and left not in found:
+                    found.add(left)
+                    stack.append(left)
+        return found
+
+    def _reachable(self):
+        if self.start is None:
+            return set()
+        found = {self.start}
+        stack = [self.start]
+        while stack:
+            for r in self.by_lhs.get(stack.pop(), ()):
+                for symbol in self.rules[r][1]:
+                    if symbol in self.nonterminals and symbol not in found:
+                        found.add(symbol)
+                        stack.append(symbol)
+        return found
+
+    def _propagate(self, sets, edges):
+        # Pushes every set along edges[A] -> B (sets[A] ⊆ sets[B]) until nothing changes;
+        # only the symbols that were actually added travel on to the successors
+        stack = [(symbol, set(values)) for symbol, values in sets.items() if values]
+        while stack:
+            symbol, added = stack.pop()
+            for target in edges.get(symbol, ()):
+                new = added - sets[target]
+                if new:
+                    sets[target] |= new
+                    stack.append((target, new))
+        return sets
+
+    def _first(self):
+        first = {symbol: set() for symbol in self.nonterminals}
+        edges = {}
+        for left, rhs in self.rules:
+            for symbol in rhs:
+                if symbol in self.nonterminals:
+                    edges.setdefault(symbol, set()).add(left)
+                    if symbol in self.nullable:
+                        continue
+                else:
+                    first[left].add(symbol)
+                break
+        return self._propagate(first, edges)
+
+    def first_of(self, symbols):
+        # FIRST of a sentential form; the second value tells whether it can derive ε
+        result = set()
+        for symbol in symbols:
+            if symbol not in self.nonterminals:
+                result.add(symbol)
+                return result, False
+            result |= self.first[symbol]
+            if symbol not in self.nullable:
+                return result, False
+        return result, True
+
+    def _follow(self):
+        follow = {symbol: set() for symbol in self.nonterminals}
+        if self.start is not None:
+            follow[self.start].add(self.END)
+        edges = {}
+        for left, rhs in self.rules:
+            # Walk right to left carrying FIRST of the suffix and whether it is nullable
+            suffix = set()
+            nullable = True
+            for symbol in reversed(rhs):
+                if symbol in self.nonterminals:
+                    follow[symbol] |= suffix
+                    if nullable:
+                        edges.setdefault(left, set()).add(symbol)
+                    if symbol in self.nullable:
+                        suffix = suffix | self.first[symbol]
+                    else:
+                        suffix = set(self.first[symbol])
+                        nullable = False
+                else:
+                    suffix = {symbol}
+                    nullable = False
+        return self._propagate(follow, edges)
+
+    def useless(self):
+        # Non-terminals that can never take part in a derivation of a terminal string
+        return self.nonterminals - (self.productive & self.reachable)
@@ -0,0 +1,70 @@
+import math
+
+# Dependency-free exporters for compiled automata. Both write straight to a text file object,
+# one state at a time, so graphs with thousands of states never need a plotting backend.
+
+def _dot_quote(text):
+    return '"' + str(text).replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+def _xml_escape(text):
+    return str(text).replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;').replace('"', '&quot;')
+
+def _grouped_edges(compiled, i):
+    # Transitions of one state merged per target, e.g. q0 -> q1 [label="a,b"]
+    grouped = {}
+    for j in range(compiled.offsets[i], compiled.offsets[i + 1]):
+        grouped.setdefault(compiled.targets[j], []).append(compiled.symbols[compiled.labels[j]])
+    return grouped.items()
+
+def write_dot(compiled, out, name="FA"):
+    out.write(f"digraph {_dot_quote(name)} {{\n")
+    out.write("  rankdir=LR;\n  node [shape=circle];\n")
+    if len(compiled.states):
+        out.write(f"  __start [shape=point, label=\"\"];\n  __start -> {_dot_quote(compiled.states[0])};\n")
+    for i in compiled.finals:
+        out.write(f"  {_dot_quote(compiled.states[i])} [shape=doublecircle];\n")
+    for i in range(len(compiled.states)):
+        source = _dot_quote(compiled.states[i])
+        for target, symbols in _grouped_edges(compiled, i):
+            out.write(f"  {source} -> {_dot_quote(compiled.states[target])} [label={_dot_quote(','.join(symbols))}];\n")
+    out.write("}\n")
+
+def write_svg(compiled, out, node_radius=18):
+    # States sit on a circle whose circumference grows with the state count
+    n = len(compiled.states)
+    spacing = node_radius * 3
+    radius = max(120, n * spacing / (2 * math.pi))
+    size = 2 * (radius + 4 * node_radius)
+    center = size / 2
+
+    def position(i):
+        angle = 2 * math.pi * i / max(n, 1) - math.pi / 2
+        return center + radius * math.cos(angle), center + radius * math.sin(angle)
+
+    out.write(f'<svg xmlns="http://www.w3.org/2000/svg" width="{size:.0f}" height="{size:.0f}" viewBox="0 0 {size:.0f} {size:.0f}" font-family="sans-serif" font-size="12">\n')
+    out.write('<defs><marker id="arrow" viewBox="0 0 10 10" refX="10" refY="5" markerWidth="6" markerHeight="6" orient="auto"><path d="M0,0 L10,5 L0,10 z"/></marker></defs>\n')
+    for i in range(n):
+        x1, y1 = position(i)
+        for target, symbols in _grouped_edges(compiled, i):
+            label = _xml_escape(','.join(symbols))
+            if target == i:
+                out.write(f'<path d="M{x1 - 8:.1f},{y1 - node_radius:.1f} C{x1 - 25:.1f},{y1 - 60:.1f} {x1 + 25:.1f},{y1 - 60:.1f} {x1 + 8:.1f},{y1 - node_radius:.1f}" fill="none" stroke="black" marker-end="url(#arrow)"/>')
+                out.write(f'<text x="{x1:.1f}" y="{y1 - 50:.1f}" text-anchor="middle">{label}</text>\n')
+                continue
+            x2, y2 = position(target)
+            length = math.hypot(x2 - x1, y2 - y1) or 1
+            dx, dy = (x2 - x1) / length * node_radius, (y2 - y1) / length * node_radius
+            out.write(f'<line x1="{x1 + dx:.1f}" y1="{y1 + dy:.1f}" x2="{x2 - dx:.1f}" y2="{y2 - dy:.1f}" stroke="black" marker-end="url(#arrow)"/>')
+            out.write(f'<text x="{(x1 + x2) / 2 + dy:.1f}" y="{(y1 + y2) / 2 - dx:.1f}" text-anchor="middle">{label}</text>\n')
+    finals = set(compiled.finals)
+    for i in range(n):
+        x, y = position(i)
+        color = 'lightgreen' if i in finals else 'skyblue'
+        out.write(f'<circle cx="{x:.1f}" cy="{y:.1f}" r="{node_radius}" fill="{color}" stroke="black"/>')
+        if i in finals:
+            out.write(f'<circle cx="{x:.1f}" cy="{y:.1f}" r="{node_radius - 3}" fill="none" stroke="black"/>')
+        out.write(f'<text x="{x:.1f}" y="{y + 4:.1f}" text-anchor="middle">{_xml_escape(compiled.states[i])}</text>\n')
+    if n:
+        x, y = position(0)
+        out.write(f'<line x1="{x - 3 * node_radius:.1f}" y1="{y:.1f}" x2="{x - node_radius:.1f}" y2="{y:.1f}" stroke="black" marker-end="url(#arrow)"/>\n')
+    out.write('</svg>\n')
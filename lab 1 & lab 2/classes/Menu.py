@@ -2,8 +2,8 @@ from classes.Automata import Automata
 from classes.Grammar import Grammar
 from classes.FiniteAutomaton import FiniteAutomaton
 
-aut = Automata()
 gr = Grammar()
+aut = Automata(gr)
 fa = FiniteAutomaton()
 
 class Menu:
@@ -23,7 +23,10 @@ class Menu:
                 aut.generating_strings()
             case 2:
                 user_input = input("Insert the string: ")
-                aut.check_string(user_input)
+                if aut.check_string(user_input):
+                    print("String can be obtained from the grammar.")
+                else:
+                    print("String cannot be obtained from the grammar.")
             case 3:
                 self.grammar_choice()
             case 4:
@@ -81,7 +84,8 @@ class Menu:
         user_choice = int(input("""Please choose the option:
 1) Convert the FA to Grammar
 2) Determine the type of FA
-3) Convert NDFA to DFA\n>>>"""))
+3) Convert NDFA to DFA
+4) Minimize the FA\n>>>"""))
 
         match user_choice:
             case 1:
@@ -89,4 +93,11 @@ class Menu:
             case 2:
                 print(fa.is_dfa())
             case 3:
-                print(fa.conversion_ndfa_to_dfa())
\ No newline at end of file
+                if fa.is_dfa() == "DFA":
+                    print("No need to convert. FA is already a DFA")
+                else:
+                    dfa = fa.conversion_ndfa_to_dfa()
+                    print(dfa)
+                    dfa.draw()
+            case 4:
+                print(fa.minimize())
\ No newline at end of file
@@ -1,6 +1,22 @@
+import argparse
+import sys
+
 from classes.Menu import Menu
+from classes.BatchRunner import run_batch
 
 mn = Menu()
 
 if __name__ == "__main__":
-    mn.main_menu()
\ No newline at end of file
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--batch", nargs="?", const="-", metavar="FILE", help="run JSONL jobs from FILE (or stdin) instead of the menu")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes for --batch, 0 runs in this process")
+    parser.add_argument("--chunksize", type=int, default=64, help="jobs handed to a worker at a time")
+    args = parser.parse_args()
+
+    if args.batch is None:
+        mn.main_menu()
+    elif args.batch == "-":
+        run_batch(sys.stdin, sys.stdout, args.workers, args.chunksize)
+    else:
+        with open(args.batch, encoding="utf-8") as source:
+            run_batch(source, sys.stdout, args.workers, args.chunksize)
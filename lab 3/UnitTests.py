@@ -0,0 +1,55 @@
+from classes.Lexer import Lexer
+from classes.TableLexer import TableLexer
+from classes.TokenType import TokenType
+
+import random
+import unittest
+
+# Characters of the lab's expressions, plus ones that trip up a table-driven lexer: digits that
+# str.isdigit() accepts but \d or int() may not, control characters str.isspace() counts as
+# whitespace (and one it does not), and operators this lab's Lexer rejects
+PLAIN = '0123456789+-() \t\n'
+SPECIAL = '٣۴²\x00\x0b\x1c\x85é*/'
+
+def random_text(rng):
+    return ''.join(rng.choice(SPECIAL if rng.random() < 0.05 else PLAIN) for _ in range(rng.randint(1, 40)))
+
+def outcome(lexer):
+    # Tokens up to EOF, or up to the error together with the exception's type and message
+    result = []
+    try:
+        while True:
+            result.append(lexer.get_next_token())
+            if result[-1].type == TokenType.EOF:
+                return result, None
+    except Exception as error:
+        return result, (type(error), str(error))
+
+class TestTableLexer(unittest.TestCase):
+    def test_random_texts(self):
+        # Same tokens, values and error as Lexer, both through get_next_token() and iteration
+        rng = random.Random(0)
+        for _ in range(3000):
+            text = random_text(rng)
+            expected = outcome(Lexer(text))
+            self.assertEqual(outcome(TableLexer(text)), expected, repr(text))
+            tokens = []
+            try:
+                tokens.extend(TableLexer(text))
+                error = None
+            except Exception as raised:
+                error = (type(raised), str(raised))
+            self.assertEqual((tokens, error), expected, repr(text))
+
+    def test_expression(self):
+        text = '3 + 5 - ( 7 - 2 )'
+        self.assertEqual(TableLexer(text).tokenize(), outcome(Lexer(text))[0])
+
+    def test_empty_text(self):
+        # The one documented difference: Lexer raises IndexError, TableLexer returns EOF
+        with self.assertRaises(IndexError):
+            Lexer('')
+        self.assertEqual(TableLexer('').tokenize()[0].type, TokenType.EOF)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import random
+import sys
+import time
+
+from classes.Lexer import Lexer
+from classes.TableLexer import TableLexer
+from classes.TokenType import TokenType
+
+# Tokens/sec of the character-by-character Lexer against the single-pass TableLexer.
+# Usage: python benchmark.py [megabytes] [seed]
+
+def make_input(size, seed):
+    rng = random.Random(seed)
+    parts = []
+    length = 0
+    while length < size:
+        part = rng.choice([str(rng.randint(0, 10 ** rng.randint(1, 12))), '+', '-', '(', ')', ' ', '  ', '\n'])
+        parts.append(part)
+        length += len(part)
+    return ''.join(parts)
+
+def run_lexer(text):
+    lexer = Lexer(text)
+    tokens = []
+    token = lexer.get_next_token()
+    while token.type != TokenType.EOF:
+        tokens.append(token)
+        token = lexer.get_next_token()
+    tokens.append(token)
+    return tokens
+
+def timed(function, text):
+    start = time.perf_counter()
+    tokens = function(text)
+    return tokens, time.perf_counter() - start
+
+def main():
+    megabytes = float(sys.argv[1]) if len(sys.argv) > 1 else 4
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    text = make_input(int(megabytes * 1024 * 1024), seed)
+    print(f"input: {len(text)} characters")
+
+    reference, lexer_time = timed(run_lexer, text)
+    table, table_time = timed(lambda text: TableLexer(text).tokenize(), text)
+    same = [(t.type, t.value) for t in reference] == [(t.type, t.value) for t in table]
+    print(f"Lexer:      {len(reference)} tokens in {lexer_time:.3f}s = {len(reference) / lexer_time:,.0f} tokens/sec")
+    print(f"TableLexer: {len(table)} tokens in {table_time:.3f}s = {len(table) / table_time:,.0f} tokens/sec")
+    print(f"speedup: {lexer_time / table_time:.1f}x, identical token streams: {same}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+import re
+
+from .Token import Token
+from .TokenType import TokenType
+
+class TableLexer:
+    # Drop-in alternative to Lexer that scans the whole text in one pass with a precompiled
+    # master pattern instead of one advance() per character. It produces exactly the same
+    # token stream, including the trailing EOF token and the error on an invalid character.
+    # The one difference: Lexer raises IndexError on an empty text, TableLexer returns EOF.
+    PATTERN = re.compile(r'(\s+)|(\d+)|([-+()])')
+    # ASCII text has no digits outside \d and no whitespace outside \s, so lexemes can be
+    # pulled out in bulk: anything that is neither a number nor an operator is invalid
+    LEXEMES = re.compile(r'[0-9]+|[-+()]|\S')
+    OPERATORS = {
+        '+': TokenType.PLUS,
+        '-': TokenType.MINUS,
+        '(': TokenType.LPAREN,
+        ')': TokenType.RPAREN,
+    }
+    # Operator tokens carry no value and are immutable, so one shared instance per lexeme will do
+    OPERATOR_TOKENS = {lexeme: Token(kind) for lexeme, kind in OPERATORS.items()}
+
+    def __init__(self, text):
+        self.text = text
+        self.pos = 0
+        self._stream = None
+
+    def __iter__(self):
+        # Yields tokens up to and including EOF; lexing stops at the first invalid character,
+        # after every token before it has been handed out, just like repeated get_next_token()
+        if self.text.isascii():
+            yield from self._scan_ascii()
+        else:
+            for _, _, token in self.spans():
+                yield token
+        yield Token(TokenType.EOF)
+
+    def _scan_ascii(self):
+        operators = self.OPERATOR_TOKENS
+        integer = TokenType.INTEGER
+        for lexeme in self.LEXEMES.findall(self.text, self.pos):
+            token = operators.get(lexeme)
+            if token is not None:
+                yield token
+            elif lexeme[0] in '0123456789':
+                yield Token(integer, int(lexeme))
+            else:
+                # No earlier occurrence of this character can exist, or it would have failed first
+                self.pos = self.text.index(lexeme, self.pos)
+                self.error()
+        self.pos = len(self.text)
+
+    def spans(self):
+        # (start, end, token) for every token from self.pos on, EOF excluded; the general path,
+        # also used where source offsets are needed
+        text = self.text
+        operators = self.OPERATOR_TOKENS
+        integer = TokenType.INTEGER
+        length = len(text)
+        while True:
+            for m in iter(self.PATTERN.scanner(text, self.pos).match, None):
+                end = m.end()
+                kind = m.lastindex
+                if kind == 2:
+                    if end < length and text[end].isdigit():
+                        break
+                    self.pos = end
+                    yield m.start(), end, Token(integer, int(m.group()))
+                else:
+                    self.pos = end
+                    if kind == 3:
+                        yield m.start(), end, operators[m.group()]
+            if self.pos >= length:
+                break
+            start = self.pos
+            token = self._other_digits()
+            yield start, self.pos, token
+
+    def _other_digits(self):
+        # str.isdigit() also accepts digits that \d does not (e.g. '²'). A digit run holding one
+        # is taken whole and handed to int() the way Lexer.integer() does, so even the error matches
+        start = self.pos
+        if not self.text[start].isdigit():
+            self.error()
+        while self.pos < len(self.text) and self.text[self.pos].isdigit():
+            self.pos += 1
+        return Token(TokenType.INTEGER, int(self.text[start:self.pos]))
+
+    def tokenize(self):
+        # Every remaining token, EOF included, as a list
+        return list(self)
+
+    def get_next_token(self):
+        if self._stream is None:
+            self._stream = iter(self)
+        token = next(self._stream, None)
+        return token if token is not None else Token(TokenType.EOF)
+
+    def error(self):
+        raise Exception('Invalid character')
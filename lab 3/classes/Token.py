@@ -1,8 +1,12 @@
-class Token:
-    # A token consists of a type and an optional value.
-    def __init__(self, type, value=None):
-        self.type = type  # The type of the token (from TokenType)
-        self.value = value  # The value of the token (relevant for integers)
+from typing import NamedTuple
+
+from .TokenType import TokenType
+
+class Token(NamedTuple):
+    # A token consists of a type and an optional value. Tokens are immutable tuples, so a long
+    # token stream costs no __dict__ per token and building one is as cheap as building a tuple.
+    type: TokenType  # The type of the token (from TokenType)
+    value: object = None  # The value of the token (relevant for integers)
 
     # Representation of the Token instance for debugging and testing.
     def __repr__(self):
@@ -0,0 +1,159 @@
+import struct
+from array import array
+
+class DAWG:
+    """
+    Minimal acyclic DFA (directed acyclic word graph) of a finite language. Shared prefixes
+    and suffixes are stored once and duplicate strings collapse, so a language that is
+    gigabytes as text often takes a few kilobytes here. State ids are assigned children
+    first, so every transition leads to a smaller id.
+    """
+    MAGIC = b'DAWG'
+    VERSION = 1
+    HEADER = struct.Struct('<4sHIII')
+
+    def __init__(self, transitions, final, start):
+        self.transitions = transitions  # One {char: state} dict per state
+        self.final = final  # One bool per state
+        self.start = start
+
+    @classmethod
+    def from_nfa(cls, nfa, start, accept):
+        """
+        Builds the DAWG of an acyclic Thompson NFA (state s reads nfa.chars[s] into
+        nfa.outs[s][0], or is an ε-state when nfa.chars[s] is None). Sets of NFA states are
+        determinized depth-first and hash-consed bottom-up: two sets with the same finality
+        and the same labelled children become one state, which yields the minimal automaton
+        directly, without ever listing the strings.
+        """
+        chars, outs = nfa.chars, nfa.outs
+
+        def closure(states):
+            seen = set(states)
+            stack = list(states)
+            while stack:
+                state = stack.pop()
+                if chars[state] is None:
+                    for target in outs[state]:
+                        if target not in seen:
+                            seen.add(target)
+                            stack.append(target)
+            return frozenset(state for state in seen if chars[state] is not None or state == accept)
+
+        def step(current, char):
+            return closure([outs[state][0] for state in current if chars[state] == char])
+
+        transitions = []
+        final = []
+        register = {}
+        done = {}
+        first = closure([start])
+        stack = [first]
+        while stack:
+            current = stack[-1]
+            if current in done:
+                stack.pop()
+                continue
+            labels = sorted(set(chars[state] for state in current if chars[state] is not None))
+            children = [step(current, char) for char in labels]
+            missing = [child for child in children if child not in done]
+            if missing:
+                stack.extend(missing)
+                continue
+            stack.pop()
+            signature = (accept in current, tuple(zip(labels, (done[child] for child in children))))
+            if signature not in register:
+                register[signature] = len(transitions)
+                transitions.append(dict(signature[1]))
+                final.append(signature[0])
+            done[current] = register[signature]
+        return cls(transitions, final, done[first])
+
+    def __contains__(self, string):
+        state = self.start
+        transitions = self.transitions
+        for char in string:
+            state = transitions[state].get(char)
+            if state is None:
+                return False
+        return self.final[state]
+
+    def __len__(self):
+        """Number of distinct strings in the language."""
+        counts = [0] * len(self.transitions)
+        for state, moves in enumerate(self.transitions):
+            counts[state] = self.final[state] + sum(counts[target] for target in moves.values())
+        return counts[self.start] if self.transitions else 0
+
+    def __iter__(self):
+        """The strings in lexicographic order, built one at a time."""
+        if not self.transitions:
+            return
+        prefix = []
+        stack = [iter(sorted(self.transitions[self.start].items()))]
+        if self.final[self.start]:
+            yield ''
+        while stack:
+            step = next(stack[-1], None)
+            if step is None:
+                stack.pop()
+                if prefix:
+                    prefix.pop()
+                continue
+            char, target = step
+            prefix.append(char)
+            if self.final[target]:
+                yield ''.join(prefix)
+            stack.append(iter(sorted(self.transitions[target].items())))
+
+    def edge_count(self):
+        return sum(len(moves) for moves in self.transitions)
+
+    def save(self, path):
+        """
+        Binary layout (little-endian): header (magic, version, states, edges, start),
+        final bitmap, offsets uint32[states + 1], labels uint32[edges] (code points),
+        targets uint32[edges].
+        """
+        offsets = array('I', [0])
+        labels = array('I')
+        targets = array('I')
+        for moves in self.transitions:
+            for char, target in sorted(moves.items()):
+                labels.append(ord(char))
+                targets.append(target)
+            offsets.append(len(labels))
+        bits = bytearray((len(self.final) + 7) // 8)
+        for state, is_final in enumerate(self.final):
+            if is_final:
+                bits[state >> 3] |= 1 << (state & 7)
+        with open(path, 'wb') as out:
+            out.write(self.HEADER.pack(self.MAGIC, self.VERSION, len(self.transitions), len(labels), self.start))
+            out.write(bytes(bits))
+            for values in (offsets, labels, targets):
+                out.write(values.tobytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as source:
+            data = source.read()
+        magic, version, states, edges, start = cls.HEADER.unpack_from(data, 0)
+        if magic != cls.MAGIC:
+            raise ValueError(f"{path} is not a DAWG file")
+        if version != cls.VERSION:
+            raise ValueError(f"Unsupported DAWG file version {version}")
+        position = cls.HEADER.size
+        bits = data[position:position + (states + 7) // 8]
+        position += len(bits)
+
+        def take(count):
+            nonlocal position
+            values = array('I')
+            values.frombytes(data[position:position + 4 * count])
+            position += 4 * count
+            return values
+
+        offsets, labels, targets = take(states + 1), take(edges), take(edges)
+        transitions = [{chr(labels[j]): targets[j] for j in range(offsets[i], offsets[i + 1])} for i in range(states)]
+        final = [bool(bits[i >> 3] >> (i & 7) & 1) for i in range(states)]
+        return cls(transitions, final, start)
@@ -0,0 +1,307 @@
+import math
+from functools import lru_cache
+
+class PatternParser:
+    """
+    Recursive-descent parser for the lab 4 pattern syntax:
+        alternation  := concatenation ('|' concatenation)*
+        concatenation := repetition*
+        repetition   := atom ('?' | '*' | '+' | '{n}' | '{m,n}' | '{m,}')*
+        atom         := '(' alternation ')' | '\\' char | char
+    The result is a tree of tuples:
+        ('char', c) | ('concat', (nodes)) | ('alt', (nodes)) | ('repeat', node, low, high)
+    where high is None for unbounded repetition.
+    """
+    SPECIAL = '()|?*+{}\\'
+
+    def __init__(self, pattern):
+        self.pattern = pattern
+        self.pos = 0
+
+    def parse(self):
+        """Parses the whole pattern and returns the root node."""
+        node = self.alternation()
+        if self.pos != len(self.pattern):
+            self.error(f"unexpected '{self.pattern[self.pos]}'")
+        return node
+
+    def error(self, message):
+        raise ValueError(f"Invalid pattern {self.pattern!r} at position {self.pos}: {message}")
+
+    def peek(self):
+        return self.pattern[self.pos] if self.pos < len(self.pattern) else None
+
+    def alternation(self):
+        options = [self.concatenation()]
+        while self.peek() == '|':
+            self.pos += 1
+            options.append(self.concatenation())
+        return options[0] if len(options) == 1 else ('alt', tuple(options))
+
+    def concatenation(self):
+        items = []
+        while self.peek() not in (None, '|', ')'):
+            items.append(self.repetition())
+        return items[0] if len(items) == 1 else ('concat', tuple(items))
+
+    def repetition(self):
+        node = self.atom()
+        while self.peek() is not None and self.peek() in '?*+{':
+            char = self.peek()
+            self.pos += 1
+            if char == '?':
+                node = ('repeat', node, 0, 1)
+            elif char == '*':
+                node = ('repeat', node, 0, None)
+            elif char == '+':
+                node = ('repeat', node, 1, None)
+            else:
+                low, high = self.bounds()
+                node = ('repeat', node, low, high)
+        return node
+
+    def bounds(self):
+        """Reads the inside of '{n}', '{m,n}' or '{m,}' (the '{' is already consumed)."""
+        end = self.pattern.find('}', self.pos)
+        if end == -1:
+            self.error("unmatched curly brace")
+        text = self.pattern[self.pos:end]
+        low, comma, high = text.partition(',')
+        if not low.isdigit() or (high and not high.isdigit()):
+            self.error(f"bad repetition '{{{text}}}'")
+        low = int(low)
+        high = (int(high) if high else None) if comma else low
+        if high is not None and high < low:
+            self.error(f"bad repetition '{{{text}}}'")
+        self.pos = end + 1
+        return low, high
+
+    def atom(self):
+        char = self.peek()
+        if char == '(':
+            self.pos += 1
+            node = self.alternation()
+            if self.peek() != ')':
+                self.error("unmatched parenthesis")
+            self.pos += 1
+            return node
+        if char == '\\':
+            self.pos += 1
+            if self.peek() is None:
+                self.error("dangling backslash")
+        elif char in self.SPECIAL:
+            self.error(f"unexpected '{char}'")
+        self.pos += 1
+        return ('char', self.pattern[self.pos - 1])
+
+def reverse(node):
+    """The node matching exactly the reversed strings of `node`."""
+    kind = node[0]
+    if kind == 'concat':
+        return ('concat', tuple(reverse(item) for item in reversed(node[1])))
+    if kind == 'alt':
+        return ('alt', tuple(reverse(option) for option in node[1]))
+    if kind == 'repeat':
+        return ('repeat', reverse(node[1]), node[2], node[3])
+    return node
+
+@lru_cache(maxsize=256)
+def parse(pattern):
+    """Parsed tree of `pattern`; repeated patterns skip parsing entirely (the tree is immutable)."""
+    return PatternParser(pattern).parse()
+
+def unparse(node):
+    """Pattern text for `node`, with the parentheses it needs."""
+    kind = node[0]
+    if kind == 'char':
+        return '\\' + node[1] if node[1] in PatternParser.SPECIAL else node[1]
+    if kind == 'concat':
+        return ''.join(unparse(item) if item[0] != 'alt' else f"({unparse(item)})" for item in node[1])
+    if kind == 'alt':
+        return '|'.join(unparse(option) for option in node[1])
+    _, item, low, high = node
+    text = unparse(item)
+    if item[0] != 'char':
+        text = f"({text})"
+    if (low, high) == (0, 1):
+        return text + '?'
+    if (low, high) == (0, None):
+        return text + '*'
+    if (low, high) == (1, None):
+        return text + '+'
+    if low == high:
+        return text + f"{{{low}}}"
+    return text + f"{{{low},{'' if high is None else high}}}"
+
+def expand(node):
+    """
+    The finite list of strings the generator produces for `node`. Unbounded repetition is
+    cut off the way the generator always did it: '*' gives 0 or 1 copies and '+' 1 or 2,
+    fewest first; bounded counts ('?', '{m,n}') go from most to fewest, so 'a?' gives
+    'a' before ''. Each copy of a repeated group picks its own alternative. Lists the whole
+    language; strings(), size() and unrank() work without doing so.
+    """
+    return list(strings(node))
+
+def copies(node):
+    """The copy counts of a 'repeat' node in generation order, as expand() lists them."""
+    _, _, low, high = node
+    return [low, low + 1] if high is None else range(high, low - 1, -1)
+
+@lru_cache(maxsize=4096)
+def size(node):
+    """
+    len(expand(node)), computed from the tree without listing a single string: a
+    concatenation multiplies its items' sizes, an alternation sums its options' sizes and a
+    repetition sums the powers of its item's size over its copy counts.
+    """
+    kind = node[0]
+    if kind == 'char':
+        return 1
+    if kind == 'concat':
+        return math.prod(size(item) for item in node[1])
+    if kind == 'alt':
+        return sum(size(option) for option in node[1])
+    item_size = size(node[1])
+    return sum(item_size ** count for count in copies(node))
+
+def unrank(node, k):
+    """expand(node)[k], found by walking the tree with size() instead of listing the strings."""
+    kind = node[0]
+    if kind == 'char':
+        return node[1]
+    if kind == 'concat':
+        return unrank_product(node[1], k)
+    if kind == 'alt':
+        for option in node[1]:
+            option_size = size(option)
+            if k < option_size:
+                return unrank(option, k)
+            k -= option_size
+        raise IndexError("string index out of range")
+    item_size = size(node[1])
+    for count in copies(node):
+        block = item_size ** count
+        if k < block:
+            return unrank_product((node[1],) * count, k)
+        k -= block
+    raise IndexError("string index out of range")
+
+def unrank_product(items, k):
+    """
+    The k-th string of the cartesian product of `items`: k is read as a mixed-radix number
+    whose last digit selects from the last item.
+    """
+    chosen = []
+    for item in reversed(items):
+        k, digit = divmod(k, size(item))
+        chosen.append(unrank(item, digit))
+    return ''.join(reversed(chosen))
+
+# Products of at most this many strings are listed once and sliced by strings()
+LISTED = 4096
+
+def strings(node, start=0, stop=None):
+    """
+    expand(node)[start:stop], produced lazily: memory stays within LISTED strings plus the
+    depth of the tree, however large the language is.
+    """
+    total = size(node)
+    stop = total if stop is None else min(stop, total)
+    if start >= stop:
+        return
+    kind = node[0]
+    if kind == 'char':
+        yield node[1]
+        return
+    if kind == 'concat':
+        yield from product_strings(node[1], start, stop)
+        return
+    # An alternation or repetition is a run of blocks, each a product of items
+    if kind == 'alt':
+        blocks = ((option,) for option in node[1])
+    else:
+        blocks = ((node[1],) * count for count in copies(node))
+    for items in blocks:
+        block = math.prod(size(item) for item in items)
+        if start < block:
+            yield from product_strings(items, start, min(stop, block))
+        start = max(start - block, 0)
+        stop -= block
+        if stop <= 0:
+            return
+
+def product_strings(items, start, stop):
+    """
+    Strings start..stop-1 of the cartesian product of `items`. The longest suffix of items
+    with at most LISTED combinations is listed once; each prefix before it is unranked and
+    joined to a slice of that list. A last item too large to list is walked recursively.
+    """
+    split = len(items)
+    tail_size = 1
+    while split > 0 and tail_size * size(items[split - 1]) <= LISTED:
+        split -= 1
+        tail_size *= size(items[split])
+    if split == len(items) and items:
+        head, last = items[:-1], items[-1]
+        last_size = size(last)
+        for h in range(start // last_size, (stop - 1) // last_size + 1):
+            prefix = unrank_product(head, h)
+            offset = h * last_size
+            for string in strings(last, max(start - offset, 0), min(stop - offset, last_size)):
+                yield prefix + string
+        return
+    head, tail = items[:split], items[split:]
+    listed = [unrank_product(tail, t) for t in range(tail_size)]
+    for h in range(start // tail_size, (stop - 1) // tail_size + 1):
+        prefix = unrank_product(head, h)
+        offset = h * tail_size
+        for string in listed[max(start - offset, 0):min(stop - offset, tail_size)]:
+            yield prefix + string
+
+def bounded(node):
+    """
+    The generator's finite reading of `node`: unbounded repetition is cut off after one
+    extra copy ('*' is 0-1, '+' is 1-2), exactly as expand() does it.
+    """
+    kind = node[0]
+    if kind == 'concat' or kind == 'alt':
+        return (kind, tuple(bounded(item) for item in node[1]))
+    if kind == 'repeat':
+        _, item, low, high = node
+        return ('repeat', bounded(item), low, low + 1 if high is None else high)
+    return node
+
+def describe(node):
+    """Plain-English reading of `node`, used only when an explanation is asked for."""
+    kind = node[0]
+    if kind == 'char':
+        return f"'{node[1]}'"
+    if kind == 'concat':
+        return "nothing" if not node[1] else " followed by ".join(describe(item) for item in node[1])
+    if kind == 'alt':
+        return "either of " + " or ".join(describe(option) for option in node[1])
+    return f"{describe(node[1])}, which {quantity(node)}"
+
+def quantity(node):
+    """How often a node appears: the predicate of an explanation sentence."""
+    if node[0] != 'repeat':
+        return "appears exactly once"
+    low, high = node[2], node[3]
+    if (low, high) == (0, 1):
+        return "is optional"
+    if (low, high) == (0, None):
+        return "appears zero or more times"
+    if (low, high) == (1, None):
+        return "appears one or more times"
+    if high is None:
+        return f"appears at least {low} times"
+    if low == high:
+        return f"appears exactly {low} times"
+    return f"appears {low} to {high} times"
+
+def explain(node):
+    """One explanation sentence for a top-level item of a pattern."""
+    subject = node[1] if node[0] == 'repeat' else node
+    text = f"({unparse(node)})" if node[0] == 'alt' else unparse(node)
+    return f"Processing '{text}': {describe(subject)[0].upper()}{describe(subject)[1:]} {quantity(node)}"
@@ -1,55 +1,64 @@
 import itertools
+import os
+import random
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+from DAWG import DAWG
+from PatternParser import parse, explain, bounded, size, strings, unrank_product
+from RegexEngine import compile as compile_regex, thompson
+
+@lru_cache(maxsize=256)
+def compile_parts(pattern):
+    """
+    Generator components of `pattern`: the top-level items of its tree, cached by pattern
+    text. Parts stay tree nodes; only their sizes are cached (by size()), never their strings.
+    """
+    tree = parse(pattern)
+    return tree[1] if tree[0] == 'concat' else (tree,)
+
+def generate_range(pattern, start, stop):
+    """
+    Strings start..stop-1 of the pattern's generation order, newline-terminated, as UTF-8.
+    They are unranked from the tree's sizes, so a worker holds one shard and never a whole part.
+    """
+    lines = list(strings(parse(pattern), start, stop))
+    lines.append('')
+    return '\n'.join(lines).encode('utf-8')
 
 class SimpleRegexGenerator:
     def __init__(self, pattern):
         self.pattern = pattern
-        self.explanation = []  # To store explanation steps
-    
-    def add_explanation(self, part, explanation):
-        """Adds an explanation for each part of the pattern being processed."""
-        self.explanation.append(f"Processing '{part}': {explanation}")
+        self._explanation = None  # Explanation steps, only built on request
+        self.compiled = None  # Matcher built by compile()
+        self.parts = None  # Top-level tree items, kept for count() / nth() / sample()
     
+    def compile(self):
+        """
+        Compiles the pattern once into a matcher with full Kleene semantics
+        (match / search / fullmatch); later calls return the same object.
+        """
+        if self.compiled is None:
+            self.compiled = compile_regex(self.pattern)
+        return self.compiled
+
     def parse_pattern(self):
         """
-        Parses the simplified pattern into components, with explanations.
-        """
-        parts = []
-        i = 0
-        while i < len(self.pattern):
-            if self.pattern[i] == '(':
-                end = self.pattern.find(')', i)
-                if end == -1:
-                    raise ValueError("Unmatched parenthesis")
-                group = self.pattern[i+1:end].split('|')
-                parts.append(group)
-                self.add_explanation(self.pattern[i:end+1], "Either of " + " or ".join(group) + " appears exactly once")
-                i = end + 1
-            elif self.pattern[i] == '{':
-                end = self.pattern.find('}', i)
-                if end == -1:
-                    raise ValueError("Unmatched curly brace")
-                repeat = int(self.pattern[i+1:end])
-                if parts:
-                    last_part = parts.pop()
-                    parts.append([''.join([c]*repeat) for c in last_part])
-                self.add_explanation(self.pattern[i-1:end+1], f"Previous character appears exactly {repeat} times")
-                i = end + 1
-            elif i + 1 < len(self.pattern) and self.pattern[i+1] in '?*+':
-                if self.pattern[i+1] == '?':
-                    parts.append([self.pattern[i], ''])
-                    self.add_explanation(self.pattern[i:i+2], f"'{self.pattern[i]}' is optional")
-                elif self.pattern[i+1] == '*':
-                    parts.append(['', self.pattern[i]])
-                    self.add_explanation(self.pattern[i:i+2], f"'{self.pattern[i]}' appears zero or more times")
-                elif self.pattern[i+1] == '+':
-                    parts.append([self.pattern[i], self.pattern[i]*2])
-                    self.add_explanation(self.pattern[i:i+2], f"'{self.pattern[i]}' appears one or more times")
-                i += 2
-            else:
-                parts.append([self.pattern[i]])
-                self.add_explanation(self.pattern[i], f"'{self.pattern[i]}' appears exactly once")
-                i += 1
-        return parts
+        Parses the pattern into components: one list of alternative strings per top-level
+        item, so the generated strings are the cartesian product of the parts. Groups may
+        nest, alternatives may be whole sub-patterns, and quantifiers apply to groups too.
+        Lists every part in full; count(), nth() and write_strings() work from the tree.
+        """
+        return [list(strings(part)) for part in self.parsed_parts()]
+
+    @property
+    def explanation(self):
+        """Explanation steps, built the first time they are asked for."""
+        if self._explanation is None:
+            self._explanation = [explain(item) for item in compile_parts(self.pattern)]
+        return self._explanation
 
     def explain_process(self):
         """Prints the explanation of how the pattern was processed."""
@@ -65,6 +74,95 @@ class SimpleRegexGenerator:
         for combination in itertools.product(*parts):
             yield ''.join(combination)
     
+    def parsed_parts(self):
+        """The top-level items of the pattern's tree, shared through the compile cache."""
+        if self.parts is None:
+            self.parts = compile_parts(self.pattern)
+        return self.parts
+
+    def count(self, parts=None):
+        """
+        Number of strings generate_strings() yields, duplicates included; the product of the
+        sizes of the parts, each computed over the tree.
+        """
+        parts = self.parsed_parts() if parts is None else parts
+        total = 1
+        for part in parts:
+            total *= size(part)
+        return total
+
+    def nth(self, k, parts=None):
+        """
+        The k-th string of generate_strings() without enumerating the ones before it:
+        k is read as a mixed-radix number whose last digit selects from the last part, and
+        each digit is unranked by walking that part's tree.
+        """
+        parts = self.parsed_parts() if parts is None else parts
+        if not 0 <= k < self.count(parts):
+            raise IndexError("string index out of range")
+        return unrank_product(parts, k)
+
+    def sample(self, n, seed=None, parts=None):
+        """n strings at distinct random positions of generate_strings(), reproducible by seed."""
+        parts = self.parsed_parts() if parts is None else parts
+        rng = random.Random(seed)
+        total = self.count(parts)
+        if n > total:
+            raise ValueError("Sample larger than the number of strings")
+        if total <= sys.maxsize:
+            indices = rng.sample(range(total), n)
+        else:
+            # range() is too long for random.sample here; redraw the (rare) repeated positions
+            indices = []
+            seen = set()
+            while len(indices) < n:
+                k = rng.randrange(total)
+                if k not in seen:
+                    seen.add(k)
+                    indices.append(k)
+        return [self.nth(k, parts) for k in indices]
+
+    def shortlex(self, max_length):
+        """
+        Distinct strings of the pattern under full Kleene semantics (unbounded '*' and '+'),
+        shortest first, up to max_length characters; produced lazily.
+        """
+        return self.compile().shortlex(max_length)
+
+    def to_dawg(self):
+        """
+        The generated language as a minimized acyclic DFA: duplicates removed, membership
+        checks with `in`, save()/DAWG.load() for storage. Built from the pattern's automaton,
+        without listing the strings or even the parts.
+        """
+        return DAWG.from_nfa(*thompson(bounded(parse(self.pattern))))
+
+    def write_strings(self, out, workers=None, shard_size=1 << 16):
+        """
+        Writes every generated string, one per line and in generate_strings() order, to the
+        binary file object `out`. The index space is cut into contiguous shards of shard_size
+        strings that a process pool renders in parallel; at most two shards per worker are in
+        flight, so memory stays bounded however large the language is. workers=0 renders the
+        shards in this process.
+        """
+        total = self.count()
+        shards = ((start, min(start + shard_size, total)) for start in range(0, total, shard_size))
+        if workers == 0:
+            for start, stop in shards:
+                out.write(generate_range(self.pattern, start, stop))
+            return total
+        workers = workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            limit = 2 * workers
+            pending = deque()
+            for start, stop in shards:
+                pending.append(pool.submit(generate_range, self.pattern, start, stop))
+                if len(pending) >= limit:
+                    out.write(pending.popleft().result())
+            while pending:
+                out.write(pending.popleft().result())
+        return total
+
     def run(self):
         parts = self.parse_pattern()
         self.explain_process()
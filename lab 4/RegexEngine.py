@@ -0,0 +1,248 @@
+from functools import lru_cache
+
+from PatternParser import parse, reverse
+
+class _NFA:
+    """Thompson NFA: state s reads chars[s] into outs[s][0], or is an ε-state when chars[s] is None."""
+    def __init__(self):
+        self.chars = []
+        self.outs = []
+
+    def state(self, char=None):
+        self.chars.append(char)
+        self.outs.append([])
+        return len(self.chars) - 1
+
+    def build(self, node):
+        """Returns (start, end) of the fragment for `node`; `end` is an ε-state without exits."""
+        kind = node[0]
+        if kind == 'char':
+            start, end = self.state(node[1]), self.state()
+            self.outs[start].append(end)
+            return start, end
+        if kind == 'concat':
+            start = end = self.state()
+            for item in node[1]:
+                first, last = self.build(item)
+                self.outs[end].append(first)
+                end = last
+            return start, end
+        if kind == 'alt':
+            start, end = self.state(), self.state()
+            for option in node[1]:
+                first, last = self.build(option)
+                self.outs[start].append(first)
+                self.outs[last].append(end)
+            return start, end
+        _, item, low, high = node
+        start = end = self.state()
+        for _ in range(low):
+            first, last = self.build(item)
+            self.outs[end].append(first)
+            end = last
+        if high is None:
+            first, last = self.build(item)
+            self.outs[end].append(first)
+            self.outs[last].append(end)
+        else:
+            exit = self.state()
+            for _ in range(high - low):
+                first, last = self.build(item)
+                self.outs[end].append(first)
+                self.outs[end].append(exit)
+                end = last
+            self.outs[end].append(exit)
+            end = exit
+        return start, end
+
+def thompson(tree):
+    """(nfa, start, accept) for a parsed pattern tree."""
+    nfa = _NFA()
+    start, accept = nfa.build(tree)
+    return nfa, start, accept
+
+class _LazyDFA:
+    """
+    Subset construction done on demand: a DFA state (a set of NFA states) and each of its
+    transitions are built the first time an input needs them and then reused by every later
+    input. When `unanchored`, the NFA start is re-entered before every character, so the DFA
+    also finds matches that begin later in the text. Past `max_states` the cache is dropped
+    and rebuilt from the current set, which bounds memory for huge automata.
+    """
+    def __init__(self, nfa, start, accept, unanchored=False, max_states=10000):
+        self.nfa = nfa
+        self.nfa_start = start
+        self.accept = accept
+        self.unanchored = unanchored
+        self.max_states = max_states
+        self.initial = self._closure([start])
+        self._reset()
+
+    def _reset(self):
+        self.index = {}
+        self.sets = []
+        self.moves = []
+        self.accepting = []
+        self.start = self._intern(self.initial)
+        self.dead = self._intern(frozenset()) if not self.unanchored else -1
+
+    def _closure(self, states):
+        outs, chars = self.nfa.outs, self.nfa.chars
+        seen = set(states)
+        stack = list(states)
+        while stack:
+            s = stack.pop()
+            if chars[s] is None:
+                for t in outs[s]:
+                    if t not in seen:
+                        seen.add(t)
+                        stack.append(t)
+        return frozenset(s for s in seen if chars[s] is not None or s == self.accept)
+
+    def _intern(self, states):
+        if states not in self.index:
+            self.index[states] = len(self.sets)
+            self.sets.append(states)
+            self.moves.append({})
+            self.accepting.append(self.accept in states)
+        return self.index[states]
+
+    def step(self, state, char):
+        """Slow path of a transition that is not cached yet; returns the next state id."""
+        chars, outs = self.nfa.chars, self.nfa.outs
+        targets = [outs[s][0] for s in self.sets[state] if chars[s] == char]
+        if self.unanchored:
+            targets.extend(self.initial)
+        closed = self._closure(targets)
+        if self.max_states is not None and len(self.sets) >= self.max_states:
+            self._reset()
+            return self._intern(closed)
+        target = self._intern(closed)
+        self.moves[state][char] = target
+        return target
+
+    def longest(self, text, pos, end, backward=False):
+        """
+        Runs from `pos` over text[pos:end] (or text[end:pos] right to left when `backward`)
+        and returns the last position at which the DFA accepted, or -1.
+        """
+        state = self.start
+        moves, accepting, dead = self.moves, self.accepting, self.dead
+        last = pos if accepting[state] else -1
+        positions = range(pos - 1, end - 1, -1) if backward else range(pos, end)
+        for i in positions:
+            char = text[i]
+            target = moves[state].get(char)
+            if target is None:
+                target = self.step(state, char)
+                moves, accepting = self.moves, self.accepting
+                dead = self.dead
+            state = target
+            if state == dead:
+                break
+            if accepting[state]:
+                last = i if backward else i + 1
+        return last
+
+class CompiledRegex:
+    """
+    A pattern compiled once into lazily determinized DFAs. Matching never backtracks and
+    reads each character at most once per pass, so it runs in time linear in the input.
+    Spans follow leftmost-longest semantics and are returned as (start, end) or None.
+    """
+    def __init__(self, pattern, max_states=10000):
+        self.pattern = pattern
+        tree = parse(pattern)
+        self.tree = tree
+        self.forward = self._dfa(tree, False, max_states)
+        # Σ* followed by the reversed pattern, run right to left: it accepts at i exactly when
+        # some match starts at i
+        self.starts = self._dfa(reverse(tree), True, max_states)
+
+    def _dfa(self, tree, unanchored, max_states):
+        nfa, start, accept = thompson(tree)
+        return _LazyDFA(nfa, start, accept, unanchored, max_states)
+
+    def match(self, text, pos=0):
+        """Longest match starting exactly at `pos`."""
+        end = self.forward.longest(text, pos, len(text))
+        return (pos, end) if end >= 0 else None
+
+    def fullmatch(self, text, pos=0):
+        """(pos, len(text)) if the whole rest of the text matches."""
+        span = self.match(text, pos)
+        return span if span is not None and span[1] == len(text) else None
+
+    def search(self, text, pos=0):
+        """Leftmost-longest match anywhere in text[pos:]."""
+        start = self.starts.longest(text, len(text), pos, backward=True)
+        if start < 0:
+            return None
+        return self.match(text, start)
+
+    def alphabet(self):
+        """The characters the pattern can match, sorted."""
+        return sorted(set(c for c in self.forward.nfa.chars if c is not None))
+
+    def shortlex(self, max_length):
+        """
+        Yields every distinct string of the language with at most `max_length` characters,
+        shortest first and alphabetically within a length. Works for unbounded repetition:
+        a private DFA is built lazily, and branches that cannot reach an accepting state in
+        exactly the remaining number of steps are never entered.
+        """
+        dfa = _LazyDFA(self.forward.nfa, self.forward.nfa_start, self.forward.accept, max_states=None)
+        alphabet = self.alphabet()
+        alive = {}
+
+        def successor(state, char):
+            target = dfa.moves[state].get(char)
+            return target if target is not None else dfa.step(state, char)
+
+        def can_finish(state, remaining):
+            # Iterative memoised check of "accepts after exactly `remaining` more characters"
+            key = (state, remaining)
+            if key not in alive:
+                stack = [key]
+                while stack:
+                    current, steps = stack[-1]
+                    if steps == 0:
+                        alive[stack.pop()] = dfa.accepting[current]
+                        continue
+                    pending = [(t, steps - 1) for t in (successor(current, c) for c in alphabet) if t != dfa.dead]
+                    missing = [item for item in pending if item not in alive]
+                    if missing:
+                        stack.extend(missing)
+                        continue
+                    alive[stack.pop()] = any(alive[item] for item in pending)
+            return alive[key]
+
+        for length in range(max_length + 1):
+            if not can_finish(dfa.start, length):
+                continue
+            # Depth-first in alphabetical order; every entered branch ends in at least one string
+            prefix = []
+            stack = [(dfa.start, iter(alphabet))]
+            while stack:
+                state, chars = stack[-1]
+                if len(prefix) == length:
+                    yield ''.join(prefix)
+                    stack.pop()
+                    if prefix:
+                        prefix.pop()
+                    continue
+                for char in chars:
+                    target = successor(state, char)
+                    if target != dfa.dead and can_finish(target, length - len(prefix) - 1):
+                        prefix.append(char)
+                        stack.append((target, iter(alphabet)))
+                        break
+                else:
+                    stack.pop()
+                    if prefix:
+                        prefix.pop()
+
+@lru_cache(maxsize=256)
+def compile(pattern, max_states=10000):
+    """Compiled matcher for `pattern`, cached by pattern text."""
+    return CompiledRegex(pattern, max_states)
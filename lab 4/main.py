@@ -1,7 +1,22 @@
+import sys
+
 from Regex import SimpleRegexGenerator
 
 # pattern = 'M?N{2}(O|P){3}Q*R+' #pattern 1
 pattern = '(X|Y|Z){3}8+(9|0)' #pattern 2
 # pattern = '(H|i)(J|K)L*N' #pattern 3
-generator = SimpleRegexGenerator(pattern)
-generator.run()
\ No newline at end of file
+
+if __name__ == "__main__":
+    generator = SimpleRegexGenerator(pattern)
+    # `python main.py strings.txt` (or `-` for stdout) writes the strings in parallel shards,
+    # `python main.py language.dawg` stores the language as a minimized acyclic DFA
+    if len(sys.argv) > 1:
+        if sys.argv[1].endswith('.dawg'):
+            generator.to_dawg().save(sys.argv[1])
+        elif sys.argv[1] == '-':
+            generator.write_strings(sys.stdout.buffer)
+        else:
+            with open(sys.argv[1], 'wb') as out:
+                generator.write_strings(out)
+    else:
+        generator.run()
@@ -0,0 +1,164 @@
+import argparse
+import json
+import platform
+import random
+import string
+import sys
+import time
+import tracemalloc
+
+from classes.CNFConverter import CNFConverter
+from classes.InternedCNFConverter import InternedCNFConverter
+
+# Scaling benchmark of the CNF conversion. Random grammars are generated from a seed, every
+# stage of every engine is timed on its own, and the results (times, tracemalloc peaks and the
+# size of the output grammar) are written as JSON, so two versions can be compared run by run.
+# Usage: python benchmark.py --nonterminals 10 20 100 1000 --seed 1 --output results.json
+
+STAGES = ['eliminate_empty', 'eliminate_renaming', 'eliminate_inaccessible', 'eliminate_non_productive', 'bring_to_chomsky']
+ENGINES = {'CNFConverter': CNFConverter, 'InternedCNFConverter': InternedCNFConverter}
+# CNFConverter finds symbols by substring search, so it only gets grammars with one-letter
+# names: S plus the capitals it does not use for its own X and Y variables
+LETTERS = 'S' + ''.join(c for c in string.ascii_uppercase if c not in 'SXY')
+
+def random_grammar(nonterminals, length, epsilon, unit_depth, rules=3, terminals=4, seed=0):
+    # Every non-terminal gets one all-terminal rule (so most of the grammar is productive) and
+    # rules - 1 random rules of 1..length symbols, each of which is ε with probability
+    # `epsilon`. Then unit chains A1 -> A2 -> ... of `unit_depth` renamings are threaded
+    # through the non-terminals in random order.
+    rng = random.Random(seed)
+    if nonterminals <= len(LETTERS):
+        Vn = list(LETTERS[:nonterminals])
+    else:
+        Vn = ['S'] + [f'N{i}' for i in range(1, nonterminals)]
+    Vt = list(string.ascii_lowercase[:terminals])
+    P = {}
+    for v in Vn:
+        P[v] = [''.join(rng.choice(Vt) for _ in range(rng.randint(1, length)))]
+        for _ in range(rules - 1):
+            if rng.random() < epsilon:
+                P[v].append('')
+            else:
+                P[v].append(''.join(rng.choice(Vn + Vt) for _ in range(rng.randint(1, length))))
+    if unit_depth:
+        order = Vn[:]
+        rng.shuffle(order)
+        for i in range(0, len(order) - 1, unit_depth + 1):
+            chain = order[i:i + unit_depth + 1]
+            for a, b in zip(chain, chain[1:]):
+                if b not in P[a]: P[a].append(b)
+    return Vn, Vt, P
+
+def grammar_size(P, Vn, Vt):
+    # Non-terminals, productions and right-hand side symbols (names split by longest match)
+    names = set(Vn) | set(Vt) | set(P)
+    lengths = sorted(set(map(len, names)), reverse=True)
+    symbols = 0
+    for v in P.values():
+        for trans in v:
+            i = 0
+            while i < len(trans):
+                i += next((n for n in lengths if trans[i:i + n] in names), 1)
+                symbols += 1
+    return {'nonterminals': len(P), 'productions': sum(len(v) for v in P.values()), 'symbols': symbols}
+
+def run_stages(converter, measure):
+    # Runs the five stages in normalize_grammar order and records measure(stage, call) for each
+    P1 = measure('eliminate_empty', lambda: converter.eliminate_empty(converter.P))
+    P2 = measure('eliminate_renaming', lambda: converter.eliminate_renaming(P1))
+    P3, Vn, Vt = measure('eliminate_inaccessible', lambda: converter.eliminate_inaccessible(P2))
+    P4, Vn = measure('eliminate_non_productive', lambda: converter.eliminate_non_productive(P3, Vn, Vt))
+    P5, Vn = measure('bring_to_chomsky', lambda: converter.bring_to_chomsky(P4, Vn, Vt))
+    if isinstance(converter, InternedCNFConverter):
+        return converter.decode(P5), [converter.names[v] for v in Vn], [converter.names[v] for v in Vt]
+    return P5, Vn, Vt
+
+def benchmark(engine, grammar, repeat):
+    # Times are the best of `repeat` runs; memory is measured in a separate traced run, since
+    # tracemalloc slows every allocation down
+    Vn, Vt, P = grammar
+    times = {stage: float('inf') for stage in STAGES}
+
+    def timed(stage, call):
+        start = time.perf_counter()
+        try:
+            result = call()
+        except Exception as error:
+            error.stage = stage
+            raise
+        times[stage] = min(times[stage], time.perf_counter() - start)
+        return result
+
+    for _ in range(repeat):
+        output = run_stages(ENGINES[engine](list(Vn), list(Vt), {k: list(v) for k, v in P.items()}), timed)
+
+    memory = {}
+
+    def traced(stage, call):
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        result = call()
+        memory[stage] = tracemalloc.get_traced_memory()[1] - before
+        return result
+
+    tracemalloc.start()
+    try:
+        run_stages(ENGINES[engine](list(Vn), list(Vt), {k: list(v) for k, v in P.items()}), traced)
+        peak = max(memory.values())
+    finally:
+        tracemalloc.stop()
+    return {
+        'seconds': times,
+        'total_seconds': sum(times.values()),
+        'peak_memory': memory,
+        'max_peak_memory': peak,
+        'output': grammar_size(*output),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark CNF normalization on random grammars")
+    parser.add_argument('--nonterminals', type=int, nargs='+', default=[5, 10, 20, 100, 1000])
+    parser.add_argument('--length', type=int, default=4, help="longest random right-hand side")
+    parser.add_argument('--epsilon', type=float, default=0.1, help="probability of a random rule being ε")
+    parser.add_argument('--unit-depth', type=int, default=2, help="length of the unit rule chains")
+    parser.add_argument('--rules', type=int, default=3, help="rules per non-terminal")
+    parser.add_argument('--terminals', type=int, default=4)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--engines', nargs='+', choices=sorted(ENGINES), default=sorted(ENGINES))
+    parser.add_argument('--label', help="version label stored with the results")
+    parser.add_argument('--output', help="JSON file to write (default: stdout)")
+    args = parser.parse_args()
+
+    results = []
+    for n in args.nonterminals:
+        grammar = random_grammar(n, args.length, args.epsilon, args.unit_depth, args.rules, args.terminals, args.seed)
+        for engine in args.engines:
+            result = {'engine': engine, 'nonterminals': n, 'input': grammar_size(grammar[2], grammar[0], grammar[1])}
+            if engine == 'CNFConverter' and n > len(LETTERS):
+                result['skipped'] = f"needs one-letter symbols, at most {len(LETTERS)} non-terminals"
+            else:
+                try:
+                    result.update(benchmark(engine, grammar, args.repeat))
+                except Exception as error:
+                    result['error'] = f"{type(error).__name__}: {error}"
+                    result['failed_stage'] = getattr(error, 'stage', None)
+            results.append(result)
+            print(engine, n, result.get('total_seconds', result.get('skipped', result.get('error'))), file=sys.stderr)
+
+    report = {
+        'label': args.label,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'parameters': {k: v for k, v in vars(args).items() if k not in ('output', 'label')},
+        'results': results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as out:
+            out.write(text + '\n')
+    else:
+        print(text)
+
+if __name__ == "__main__":
+    main()
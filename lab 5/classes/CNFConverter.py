@@ -66,9 +66,10 @@ class CNFConverter:
                  #Marks the renamings that lead to Vn that leads to empty 
                 if (empty_set[em] in v) and (k not in empty_set):
                     empty_set.append(k)
-                #Marks the Vn that leads to empty and deletes the empty transition
-                if "empty" in v:
-                    P[k].remove(empty_set[em])
+                #Marks the Vn that leads to empty and deletes its empty transitions (all of them,
+                #a duplicate left behind would be mistaken for a renaming in the next passes)
+                if empty_set[em] == "empty":
+                    while "empty" in v: v.remove("empty")
                
             em += 1
     
@@ -199,7 +200,8 @@ class CNFConverter:
                 else:
                     tmp = self.prepare_transition(trans, Vt, Vn)
                     #If more than 2 variables, converts recursively from end to begin
-                    if len(tmp) > 4: tmp = tmp[:2] + self.convert_transition(tmp[2:])
+                    first = self.symbol_length(tmp)
+                    if self.symbol_count(tmp) > 2: tmp = tmp[:first] + self.convert_transition(tmp[first:])
                     #Gets rid of spare spaces if possible and appends to grammar
                     try: P5[k].append(tmp.replace(" ", ""))
                     except: P5[k].append(tmp)
@@ -235,10 +237,27 @@ class CNFConverter:
             if i in transition: transition = transition.replace(i , i + " ")
         return transition
     
+    #Length of the first symbol of a prepared transition: a Vn padded with a space, or an X/Y
+    #variable with all the digits of its number (Y10 is one symbol, not Y1 followed by 0)
+    def symbol_length(self, trans):
+        if trans[0] in "XY":
+            i = 1
+            while i < len(trans) and trans[i].isdigit(): i += 1
+            return i
+        return 2
+
+    #Number of symbols in a prepared transition
+    def symbol_count(self, trans):
+        count = 0
+        while trans:
+            trans = trans[self.symbol_length(trans):]
+            count += 1
+        return count
+
     #Recursive function converts the grammar into Chomsky normal form
     def convert_transition(self, trans): 
         #If receives less than 3 symbols, returns a Y.
-        if len(trans) <= 4:
+        if self.symbol_count(trans) <= 2:
             #If the Y doesnt exist, creates one.
             if trans not in self.aux.keys():
                 self.create_Y(trans)
@@ -246,4 +265,5 @@ class CNFConverter:
         #If it receives more than 2, it separates the first symbol, 
         #Converts the rest recursively, then merges them and converts the solution one last time
         else:
-            return self.convert_transition(trans[0:2] + self.convert_transition(trans[2:]))
\ No newline at end of file
+            first = self.symbol_length(trans)
+            return self.convert_transition(trans[:first] + self.convert_transition(trans[first:]))
\ No newline at end of file
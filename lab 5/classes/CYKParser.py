@@ -0,0 +1,206 @@
+class CYKParser:
+    # CYK recognizer and parser for a grammar in Chomsky normal form, such as the P, Vn and Vt
+    # left by CNFConverter.normalize_grammar(). Every chart cell is a Python int used as a
+    # bitset over the non-terminals, so combining two cells is a few integer AND/OR operations
+    # instead of a loop over rules. Unit rules A -> B, which the conversion can leave behind,
+    # are folded into the cells as well.
+    def __init__(self, P, Vn, Vt, start='S'):
+        self.Vn = list(Vn)
+        self.Vt = list(Vt)
+        self.bit = {v: i for i, v in enumerate(self.Vn)}
+        self.start = self.bit[start]
+        self.lengths = sorted(set(len(name) for name in self.Vn + self.Vt), reverse=True)
+        self.terminal = {}
+        self.binary = {}
+        units = {}
+        for k, v in P.items():
+            a = self.bit[k]
+            for trans in v:
+                rhs = self.split(trans)
+                if len(rhs) == 1 and rhs[0] in self.Vt:
+                    self.terminal[rhs[0]] = self.terminal.get(rhs[0], 0) | 1 << a
+                elif len(rhs) == 1 and rhs[0] in self.bit:
+                    units.setdefault(self.bit[rhs[0]], []).append(a)
+                elif len(rhs) == 2 and all(s in self.bit for s in rhs):
+                    b, c = self.bit[rhs[0]], self.bit[rhs[1]]
+                    self.binary.setdefault(b, {})
+                    self.binary[b][c] = self.binary[b].get(c, 0) | 1 << a
+                else:
+                    raise ValueError(f"Production {k} -> {trans} is not in Chomsky normal form")
+        # For every left symbol B, the mask of all right symbols C with some A -> BC
+        self.rights = {b: sum(1 << c for c in v) for b, v in self.binary.items()}
+        self.up = self.unit_closure(units)
+        self.down = {}
+        for b, v in units.items():
+            for a in v: self.down.setdefault(a, []).append(b)
+        self.direct_terminal = dict(self.terminal)
+        for t, mask in self.terminal.items():
+            self.terminal[t] = self.close(mask)
+
+    #Splits a production into symbol names, taking the longest known name at each position
+    def split(self, trans):
+        if not isinstance(trans, str):
+            return list(trans)
+        symbols = []
+        i = 0
+        while i < len(trans):
+            for n in self.lengths:
+                if trans[i:i + n] in self.bit or trans[i:i + n] in self.Vt:
+                    symbols.append(trans[i:i + n])
+                    i += n
+                    break
+            else:
+                raise ValueError(f"Cannot split production {trans!r} into symbols at position {i}")
+        return symbols
+
+    #For every B, the mask of all A with A =>* B through unit rules (B included)
+    def unit_closure(self, units):
+        up = {}
+        for b in units:
+            mask = 1 << b
+            stack = [b]
+            while stack:
+                for a in units.get(stack.pop(), ()):
+                    if not mask >> a & 1:
+                        mask |= 1 << a
+                        stack.append(a)
+            up[b] = mask
+        return up
+
+    #Adds to a cell every non-terminal that reaches one of its members through unit rules
+    def close(self, mask):
+        if not self.up: return mask
+        result = mask
+        for b, closure in self.up.items():
+            if mask >> b & 1: result |= closure
+        return result
+
+    #The input as a list of terminals (greedy longest match for text), or None if it has other symbols
+    def tokens(self, word):
+        if not isinstance(word, str):
+            word = list(word)
+            return word if all(t in self.terminal for t in word) else None
+        tokens = []
+        i = 0
+        while i < len(word):
+            for n in self.lengths:
+                if word[i:i + n] in self.terminal:
+                    tokens.append(word[i:i + n])
+                    i += n
+                    break
+            else:
+                return None
+        return tokens
+
+    #Non-terminals A with A -> BC for some B in `left` and C in `right`
+    def combine(self, left, right):
+        result = 0
+        binary, rights = self.binary, self.rights
+        while left:
+            low = left & -left
+            left ^= low
+            b = low.bit_length() - 1
+            if right & rights.get(b, 0):
+                for c, mask in binary[b].items():
+                    if right >> c & 1: result |= mask
+        return result
+
+    #chart[l][i] is the bitset of non-terminals deriving tokens[i:i + l]
+    def chart(self, tokens):
+        n = len(tokens)
+        chart = [None, [self.terminal[t] for t in tokens]]
+        for l in range(2, n + 1):
+            row = []
+            for i in range(n - l + 1):
+                cell = 0
+                for k in range(1, l):
+                    left, right = chart[k][i], chart[l - k][i + k]
+                    if left and right: cell |= self.combine(left, right)
+                row.append(self.close(cell) if cell else 0)
+            chart.append(row)
+        return chart
+
+    #Whether the start symbol derives the word (a string over Vt or a sequence of terminals)
+    def recognize(self, word):
+        tokens = self.tokens(word)
+        if not tokens: return False
+        return bool(self.chart(tokens)[len(tokens)][0] >> self.start & 1)
+
+    #Recognizes many words at once; repeated words are only parsed once
+    def recognize_many(self, words):
+        results = {}
+        answers = []
+        for word in words:
+            key = word if isinstance(word, str) else tuple(word)
+            if key not in results: results[key] = self.recognize(word)
+            answers.append(results[key])
+        return answers
+
+    #A derivation tree of the word, or None if it is not in the language. Inner nodes are
+    #(A, left, right) or (A, child) for a unit rule, leaves are (A, terminal). Built without
+    #recursion, so long words work
+    def derivation(self, word):
+        tokens = self.tokens(word)
+        if not tokens: return None
+        chart = self.chart(tokens)
+        n = len(tokens)
+        if not chart[n][0] >> self.start & 1: return None
+        direct = {}
+        nodes = {}
+        stack = [(self.start, 0, n)]
+        while stack:
+            key = stack[-1]
+            if key in nodes:
+                stack.pop()
+                continue
+            children = self.expand(chart, tokens, direct, *key)
+            missing = [child for child in children if child not in nodes]
+            if missing:
+                stack.extend(missing)
+                continue
+            stack.pop()
+            if not children:
+                nodes[key] = (self.Vn[key[0]], tokens[key[1]])
+            else:
+                nodes[key] = (self.Vn[key[0]],) + tuple(nodes[child] for child in children)
+        return nodes[(self.start, 0, n)]
+
+    #Non-terminals deriving tokens[i:i + l] with a terminal or binary rule as the first step
+    def direct_mask(self, chart, tokens, direct, i, l):
+        if (i, l) not in direct:
+            if l == 1:
+                direct[(i, l)] = self.direct_terminal.get(tokens[i], 0)
+            else:
+                cell = 0
+                for k in range(1, l):
+                    left, right = chart[k][i], chart[l - k][i + k]
+                    if left and right: cell |= self.combine(left, right)
+                direct[(i, l)] = cell
+        return direct[(i, l)]
+
+    #The cells (B, i, l) the first step of a derivation of tokens[i:i + l] from A leads to: none
+    #for a terminal rule, two for a binary rule, one for a unit rule. Unit rules are followed
+    #towards the nearest non-terminal with a direct derivation, so they never loop
+    def expand(self, chart, tokens, direct, a, i, l):
+        if self.direct_mask(chart, tokens, direct, i, l) >> a & 1:
+            if l == 1: return []
+            for k in range(1, l):
+                left, right = chart[k][i], chart[l - k][i + k]
+                while left:
+                    low = left & -left
+                    left ^= low
+                    b = low.bit_length() - 1
+                    for c, mask in self.binary.get(b, {}).items():
+                        if right >> c & 1 and mask >> a & 1:
+                            return [(b, i, k), (c, i + k, l - k)]
+        first = {b: b for b in self.down.get(a, ())}
+        queue = list(first)
+        while queue:
+            b = queue.pop(0)
+            if self.direct_mask(chart, tokens, direct, i, l) >> b & 1:
+                return [(first[b], i, l)]
+            for c in self.down.get(b, ()):
+                if c not in first:
+                    first[c] = first[b]
+                    queue.append(c)
+        raise ValueError(f"No derivation of {self.Vn[a]} over tokens {i}..{i + l}")
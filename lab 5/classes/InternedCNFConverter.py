@@ -0,0 +1,275 @@
+class InternedCNFConverter:
+    # Same pipeline as CNFConverter, but every symbol is interned to an int id and every
+    # production is a tuple of ids, so symbol names of any length (X12, Expr) are handled
+    # exactly. Terminals get the ids 0 .. len(Vt) - 1, non-terminals the ids after them.
+    # Each stage takes and returns {lhs id: [rhs tuple, ...]} and never mutates its input.
+    NULLABLE_LIMIT = 4
+
+    def __init__(self, Vn, Vt, P, start='S'):
+        self.names = list(Vt) + [v for v in Vn if v not in Vt]
+        self.ids = {name: i for i, name in enumerate(self.names)}
+        self.terminals = len(Vt)
+        self.start = self.ids[start]
+        self.counters = {}
+        self.Vn = list(Vn)
+        self.Vt = list(Vt)
+        self.P = self.create_P(P)
+
+    #Splits every production into symbol ids, taking the longest symbol name at each position
+    def create_P(self, P):
+        lengths = sorted(set(len(name) for name in self.names), reverse=True)
+        P1 = {}
+        for key in P:
+            rules = P1.setdefault(self.ids[key], {})
+            for production in P[key]:
+                rules[self.split(production, lengths)] = None
+        return {k: list(v) for k, v in P1.items()}
+
+    #Production text (or an already split sequence of names) as a tuple of ids; '' and 'empty' are ε
+    def split(self, production, lengths):
+        if not isinstance(production, str):
+            return tuple(self.ids[name] for name in production)
+        if production in ('', 'empty'):
+            return ()
+        rhs = []
+        i = 0
+        while i < len(production):
+            for n in lengths:
+                symbol = self.ids.get(production[i:i + n])
+                if symbol is not None:
+                    rhs.append(symbol)
+                    i += n
+                    break
+            else:
+                raise ValueError(f"Cannot split production {production!r} into symbols at position {i}")
+        return tuple(rhs)
+
+    #Terminals are interned first, so a symbol is a terminal exactly when its id is below their count
+    def is_terminal(self, symbol):
+        return symbol < self.terminals
+
+    #Runs all five stages and stores the result as names, in the CNFConverter format
+    def normalize_grammar(self):
+        P1 = self.eliminate_empty(self.P)
+        P2 = self.eliminate_renaming(P1)
+        P3, Vn, Vt = self.eliminate_inaccessible(P2)
+        P4, Vn = self.eliminate_non_productive(P3, Vn, Vt)
+        P5, Vn = self.bring_to_chomsky(P4, Vn, Vt)
+        self.rules = P5
+        self.P = self.decode(P5)
+        self.Vn = [self.names[v] for v in Vn]
+        self.Vt = [self.names[v] for v in Vt]
+        return self.P, self.Vn, self.Vt
+
+    #Productions as {name: [concatenated names]}, like CNFConverter.P
+    def decode(self, P):
+        names = self.names
+        return {names[k]: [''.join(names[s] for s in rhs) for rhs in v] for k, v in P.items()}
+
+    #Non-terminals that derive ε: a rule fires once its count of not-yet-nullable symbols reaches 0
+    def find_empty(self, P):
+        nullable = set()
+        remaining = []
+        occurrences = {}
+        queue = []
+        for k, v in P.items():
+            for rhs in v:
+                if any(self.is_terminal(s) for s in rhs): continue
+                remaining.append(len(rhs))
+                for s in rhs:
+                    occurrences.setdefault(s, []).append((len(remaining) - 1, k))
+                if not rhs and k not in nullable:
+                    nullable.add(k)
+                    queue.append(k)
+        while queue:
+            for rule, k in occurrences.get(queue.pop(), ()):
+                remaining[rule] -= 1
+                if remaining[rule] == 0 and k not in nullable:
+                    nullable.add(k)
+                    queue.append(k)
+        return nullable
+
+    #First Step: drops ε-rules and adds every variant of a rule without some of its nullable symbols.
+    #A rule with more than NULLABLE_LIMIT nullable symbols is split into a Y chain first, so that no
+    #rule has more than 2^NULLABLE_LIMIT variants
+    def eliminate_empty(self, P):
+        nullable = self.find_empty(P)
+        aux = {}
+        split = {}
+        for k, v in P.items():
+            rules = split.setdefault(k, [])
+            for rhs in v:
+                if len(rhs) > self.NULLABLE_LIMIT and sum(s in nullable for s in rhs) > self.NULLABLE_LIMIT:
+                    while len(rhs) > 2:
+                        y = self.create_aux('Y', rhs[-2:], aux, split)
+                        if rhs[-2] in nullable and rhs[-1] in nullable: nullable.add(y)
+                        rhs = rhs[:-2] + (y,)
+                rules.append(rhs)
+        P1 = {}
+        for k, v in split.items():
+            rules = {}
+            for rhs in v:
+                if nullable.isdisjoint(rhs):
+                    if rhs and rhs != (k,): rules[rhs] = None
+                    continue
+                variants = [()]
+                for s in rhs:
+                    if s in nullable: variants = [tmp + (s,) for tmp in variants] + variants
+                    else: variants = [tmp + (s,) for tmp in variants]
+                for tmp in variants:
+                    if tmp and tmp != (k,): rules[tmp] = None
+            P1[k] = list(rules)
+        return P1
+
+    #Second Step: every non-terminal takes the non-unit rules of all non-terminals it renames to.
+    #Non-terminals on a cycle of unit rules derive the same strings, so each cycle is first merged
+    #into one representative; the closures are then unions taken in topological order
+    def eliminate_renaming(self, P):
+        rep, order = self.unit_components(P)
+        merged = {w: r for w, r in rep.items() if w != r}
+        closures = {}
+        for component in order:
+            r = rep[component[0]]
+            rules = {}
+            successors = {}
+            for u in component:
+                for rhs in P.get(u, ()):
+                    if len(rhs) == 1 and not self.is_terminal(rhs[0]):
+                        w = rep[rhs[0]]
+                        if w != r: successors[w] = None
+                    elif merged.keys().isdisjoint(rhs):
+                        rules[rhs] = None
+                    else:
+                        rules[tuple(merged.get(s, s) for s in rhs)] = None
+            for w in successors:
+                rules.update(closures[w])
+            closures[r] = rules
+        return {k: list(closures[rep[k]]) for k in P}
+
+    #Strongly connected components of the unit-rule graph (iterative Tarjan). Returns each
+    #non-terminal's representative (the start symbol where possible) and the components, every
+    #component after all components it has unit rules into
+    def unit_components(self, P):
+        index = {}
+        low = {}
+        stack = []
+        on_stack = set()
+        rep = {}
+        order = []
+        for root in P:
+            if root in index: continue
+            work = [(root, iter(P[root]))]
+            index[root] = low[root] = len(index)
+            stack.append(root)
+            on_stack.add(root)
+            while work:
+                v, rules = work[-1]
+                for rhs in rules:
+                    if len(rhs) != 1 or self.is_terminal(rhs[0]): continue
+                    w = rhs[0]
+                    if w not in index:
+                        index[w] = low[w] = len(index)
+                        stack.append(w)
+                        on_stack.add(w)
+                        work.append((w, iter(P.get(w, ()))))
+                        break
+                    if w in on_stack: low[v] = min(low[v], index[w])
+                else:
+                    work.pop()
+                    if work: low[work[-1][0]] = min(low[work[-1][0]], low[v])
+                    if low[v] == index[v]:
+                        component = []
+                        while True:
+                            w = stack.pop()
+                            on_stack.discard(w)
+                            component.append(w)
+                            if w == v: break
+                        r = self.start if self.start in component else v
+                        for w in component: rep[w] = r
+                        order.append(component)
+        return rep, order
+
+    #Third Step: keeps the symbols reachable from the start symbol
+    def eliminate_inaccessible(self, P):
+        access = {self.start: None}
+        queue = [self.start]
+        while queue:
+            for rhs in P.get(queue.pop(), ()):
+                for s in rhs:
+                    if s not in access:
+                        access[s] = None
+                        if not self.is_terminal(s): queue.append(s)
+        P3 = {k: P[k] for k in access if k in P}
+        Vn = [s for s in access if not self.is_terminal(s)]
+        Vt = [s for s in access if self.is_terminal(s)]
+        return P3, Vn, Vt
+
+    #Non-terminals that derive a terminal string, by the same counting worklist as find_empty
+    def find_productive(self, P):
+        productive = set()
+        remaining = []
+        occurrences = {}
+        queue = []
+        for k, v in P.items():
+            for rhs in v:
+                count = 0
+                for s in rhs:
+                    if not self.is_terminal(s):
+                        count += 1
+                        occurrences.setdefault(s, []).append((len(remaining), k))
+                remaining.append(count)
+                if count == 0 and k not in productive:
+                    productive.add(k)
+                    queue.append(k)
+        while queue:
+            for rule, k in occurrences.get(queue.pop(), ()):
+                remaining[rule] -= 1
+                if remaining[rule] == 0 and k not in productive:
+                    productive.add(k)
+                    queue.append(k)
+        return productive
+
+    #Fourth Step: drops non-productive symbols and every rule that mentions one. Symbols that were
+    #only reachable through such rules are dropped as well
+    def eliminate_non_productive(self, P, Vn, Vt):
+        productive = self.find_productive(P)
+        P4 = {}
+        for k, v in P.items():
+            if k in productive:
+                P4[k] = [rhs for rhs in v if all(self.is_terminal(s) or s in productive for s in rhs)]
+        if self.start not in productive: return {}, []
+        P4, Vn, _ = self.eliminate_inaccessible(P4)
+        return P4, Vn
+
+    #Last Step: terminals inside longer rules become X non-terminals, rules longer than 2 are split
+    #into chains of Y non-terminals. Equal suffixes share one Y
+    def bring_to_chomsky(self, P, Vn, Vt):
+        P5 = {}
+        self.aux = {}
+        aux_rules = {}
+        for k, v in P.items():
+            rules = {}
+            for rhs in v:
+                if len(rhs) == 1:
+                    rules[rhs] = None
+                    continue
+                tmp = tuple(self.create_aux('X', (s,), self.aux, aux_rules) if self.is_terminal(s) else s for s in rhs)
+                while len(tmp) > 2:
+                    tmp = tmp[:-2] + (self.create_aux('Y', tmp[-2:], self.aux, aux_rules),)
+                rules[tmp] = None
+            P5[k] = list(rules)
+        P5.update(aux_rules)
+        return P5, list(Vn) + list(aux_rules)
+
+    #Returns the auxiliary non-terminal deriving exactly `rhs`, creating it with a fresh name if needed
+    def create_aux(self, prefix, rhs, aux, aux_rules):
+        if rhs not in aux:
+            i = self.counters.get(prefix, 0)
+            while prefix + str(i) in self.ids: i += 1
+            self.counters[prefix] = i + 1
+            symbol = len(self.names)
+            self.names.append(prefix + str(i))
+            self.ids[prefix + str(i)] = symbol
+            aux[rhs] = symbol
+            aux_rules[symbol] = [rhs]
+        return aux[rhs]
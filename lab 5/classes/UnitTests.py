@@ -1,4 +1,6 @@
 from CNFConverter import CNFConverter
+from InternedCNFConverter import InternedCNFConverter
+from CYKParser import CYKParser
 
 import unittest
 
@@ -38,6 +40,119 @@ class TestCNFConverter(unittest.TestCase):
         self.assertIn('a', self.converter.P['A'])
         self.assertIn('ACSC', self.converter.P['A'])
 
+    def test_duplicate_epsilon(self):
+        converter = CNFConverter(['S', 'A'], ['a', 'b'], {'S': ['aA'], 'A': ['', 'b', '']})
+        P1 = converter.eliminate_empty(converter.P)
+        self.assertNotIn('empty', P1['A'])
+        self.assertIn('a', P1['S'])
+
+    def test_many_auxiliary_variables(self):
+        # A 15-symbol rule needs more than ten Y variables; Y10 must be read as one symbol
+        converter = CNFConverter(['S'], ['a'], {'S': ['a' * 15]})
+        P, Vn = converter.bring_to_chomsky(converter.P, list(converter.Vn), converter.Vt)
+        self.assertIn('Y10', Vn)
+        parser = CYKParser(P, Vn, converter.Vt)
+        self.assertEqual(parser.recognize_many(['a' * 15, 'a' * 14, 'a' * 16]), [True, False, False])
+
+class TestInternedCNFConverter(unittest.TestCase):
+    def setUp(self):
+        self.Vn = ['S', 'A', 'B', 'C', 'E']
+        self.Vt = ['a', 'b']
+        self.P = {
+            'S': ['aB', 'AC'],
+            'A': ['a', 'ACSC', 'BC'],
+            'B': ['b', 'aA'],
+            'C': ['', 'BA'],
+            'E': ['bB']
+        }
+        self.converter = InternedCNFConverter(self.Vn, self.Vt, self.P)
+
+    def assertChomsky(self, P, Vn, Vt):
+        for k, v in P.items():
+            self.assertIn(k, Vn)
+            for trans in v:
+                rhs = self.converter.split(trans, sorted(set(map(len, Vn + Vt)), reverse=True))
+                names = [self.converter.names[s] for s in rhs]
+                self.assertTrue(names in ([t] for t in Vt) or (len(names) == 2 and all(n in Vn for n in names)), (k, trans))
+
+    def test_production_splitting(self):
+        converter = InternedCNFConverter(['S', 'Expr', 'X12'], ['x', '+'], {'S': ['Expr'], 'Expr': ['Expr+X12', 'x'], 'X12': ['x']})
+        expr, x12, plus = converter.ids['Expr'], converter.ids['X12'], converter.ids['+']
+        self.assertEqual(converter.P[expr], [(expr, plus, x12), (converter.ids['x'],)])
+        with self.assertRaises(ValueError):
+            InternedCNFConverter(['S'], ['a'], {'S': ['ab']})
+
+    def test_epsilon_elimination(self):
+        P1 = self.converter.eliminate_empty(self.converter.P)
+        C, B, A = (self.converter.ids[v] for v in 'CBA')
+        self.assertNotIn((), P1[C])
+        self.assertIn((B, A), P1[C])
+        # C is nullable, so A -> BC also gives A -> B
+        self.assertIn((B,), P1[A])
+
+    def test_unit_production_elimination(self):
+        P2 = self.converter.eliminate_renaming(self.converter.eliminate_empty(self.converter.P))
+        for k, v in P2.items():
+            for rhs in v:
+                self.assertFalse(len(rhs) == 1 and not self.converter.is_terminal(rhs[0]))
+        self.assertIn((self.converter.ids['b'],), P2[self.converter.ids['A']])
+
+    def test_normal_form(self):
+        P, Vn, Vt = self.converter.normalize_grammar()
+        # E is inaccessible
+        self.assertNotIn('E', Vn)
+        self.assertChomsky(P, Vn, Vt)
+
+    def test_multi_character_symbols(self):
+        Vn = ['S', 'Expr', 'Term', 'X0']
+        Vt = ['num', '+', '*']
+        P = {'S': ['Expr'], 'Expr': ['Expr+Term', 'Term'], 'Term': ['Term*X0', 'X0'], 'X0': ['num', '(Expr)']}
+        with self.assertRaises(ValueError):
+            InternedCNFConverter(Vn, Vt, P)
+        P['X0'] = ['num']
+        self.converter = InternedCNFConverter(Vn, Vt, P)
+        P, Vn, Vt = self.converter.normalize_grammar()
+        self.assertEqual(len(Vn), len(set(Vn)))
+        self.assertIn('num', P['S'])
+        self.assertChomsky(P, Vn, Vt)
+
+class TestCYKParser(unittest.TestCase):
+    def setUp(self):
+        Vn = ['S', 'Expr', 'Term', 'Factor']
+        Vt = ['n', '+', '*', '(', ')']
+        P = {'S': ['Expr'], 'Expr': ['Expr+Term', 'Term'], 'Term': ['Term*Factor', 'Factor'], 'Factor': ['n', '(Expr)']}
+        self.parser = CYKParser(*InternedCNFConverter(Vn, Vt, P).normalize_grammar())
+
+    def test_recognition(self):
+        self.assertTrue(self.parser.recognize('n+n*(n+n)'))
+        self.assertTrue(self.parser.recognize(['(', 'n', ')']))
+        self.assertFalse(self.parser.recognize('n+'))
+        self.assertFalse(self.parser.recognize('n-n'))
+        self.assertFalse(self.parser.recognize(''))
+
+    def test_batch_recognition(self):
+        self.assertEqual(self.parser.recognize_many(['n', 'n*n', ')(', 'n', '(n']), [True, True, False, True, False])
+
+    def test_derivation(self):
+        self.assertIsNone(self.parser.derivation('nn'))
+        tree = self.parser.derivation('n*(n+n)')
+        self.assertEqual(tree[0], 'S')
+        leaves = []
+        stack = [tree]
+        while stack:
+            node = stack.pop()
+            if isinstance(node[1], str): leaves.append(node[1])
+            else: stack.extend(reversed(node[1:]))
+        self.assertEqual(''.join(leaves), 'n*(n+n)')
+
+    def test_cnf_converter_output(self):
+        converter = CNFConverter(['S', 'A', 'B'], ['a', 'b'], {'S': ['AB'], 'A': ['a'], 'B': ['b', 'bB']})
+        P, Vn = converter.bring_to_chomsky(converter.P, list(converter.Vn), converter.Vt)
+        parser = CYKParser(P, Vn, converter.Vt)
+        self.assertEqual(parser.recognize_many(['ab', 'abbb', 'ba', 'a']), [True, True, False, False])
+        with self.assertRaises(ValueError):
+            CYKParser({'S': ['aSb']}, ['S'], ['a', 'b'])
+
 # Run the tests
 if __name__ == '__main__':
     unittest.main()
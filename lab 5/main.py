@@ -1,4 +1,5 @@
 from classes.CNFConverter import CNFConverter
+from classes.CYKParser import CYKParser
 
 Vn = ['S', 'A', 'B', 'C', 'E']  # Non-terminal symbols
 Vt = ['a', 'b']  # Terminal symbols
@@ -12,4 +13,9 @@ P = {
 
 chomsky_grammar = CNFConverter(Vn, Vt, P)
 
-chomsky_grammar.normalize_grammar()
\ No newline at end of file
+chomsky_grammar.normalize_grammar()
+#Recognizes a few words with the resulting grammar
+parser = CYKParser(chomsky_grammar.P, chomsky_grammar.Vn, chomsky_grammar.Vt)
+words = ['ab', 'aab', 'ba']
+for word, accepted in zip(words, parser.recognize_many(words)):
+    print(word, "accepted" if accepted else "rejected", parser.derivation(word) or "")
@@ -0,0 +1,243 @@
+from classes.Lexer import Lexer
+from classes.LexerGenerator import LexerGenerator
+from classes.IncrementalLexer import IncrementalLexer
+from classes.TableLexer import TableLexer
+from classes.StreamLexer import StreamLexer
+from classes.TokenBuffer import TokenBuffer
+from classes.Parser import Parser
+from classes.Token import Token
+from classes.TokenType import TokenType
+from classes.ASTExport import write_dot
+
+import io
+import random
+import unittest
+
+# Characters of the lab's expressions, plus ones that trip up a table-driven lexer: digits that
+# str.isdigit() accepts but \d or int() may not, and control characters str.isspace() counts as
+# whitespace (and one it does not)
+PLAIN = '0123456789+-*/() \t\n'
+SPECIAL = '٣۴²\x00\x0b\x1c\x85é'
+
+def random_text(rng):
+    return ''.join(rng.choice(SPECIAL if rng.random() < 0.05 else PLAIN) for _ in range(rng.randint(0, 40)))
+
+def outcome(tokens_or_lexer):
+    # Tokens up to EOF, or up to the error together with the exception's type and message;
+    # takes a lexer (read with get_next_token) or any iterable of tokens
+    result = []
+    next_token = getattr(tokens_or_lexer, 'get_next_token', None) or iter(tokens_or_lexer).__next__
+    try:
+        while True:
+            result.append(next_token())
+            if result[-1].type == TokenType.EOF:
+                return result, None
+    except Exception as error:
+        return result, (type(error), str(error))
+
+def tokens(lexer):
+    # Reads the whole token stream, EOF included
+    result = [lexer.get_next_token()]
+    while result[-1].type != TokenType.EOF:
+        result.append(lexer.get_next_token())
+    return result
+
+class TestLexerGenerator(unittest.TestCase):
+    def setUp(self):
+        self.generator = LexerGenerator()
+
+    def assertSameTokens(self, text):
+        self.assertEqual(tokens(self.generator.lexer(text)), tokens(Lexer(text)), repr(text))
+
+    def test_integer_values_are_ints(self):
+        token = self.generator.lexer('42').get_next_token()
+        self.assertEqual(token.type, TokenType.INTEGER)
+        self.assertEqual(token.value, 42)
+
+    def test_leading_zeros_are_one_token(self):
+        # Lexer reads the whole digit run, so '007' is the single INTEGER 7
+        self.assertEqual(tokens(self.generator.lexer('007')), tokens(Lexer('007')))
+        self.assertEqual(len(tokens(self.generator.lexer('007'))), 2)
+
+    def test_expressions(self):
+        for text in ['3 + 5 - ( 7 - 2 )', '1+2*3/4', '((10))', '  12\t*\n(0 - 00)  ', '', '   ']:
+            self.assertSameTokens(text)
+
+    def test_random_texts(self):
+        # Same token types and values as Lexer on random strings of the lab's characters
+        rng = random.Random(0)
+        for _ in range(500):
+            self.assertSameTokens(''.join(rng.choice('0123456789+-*/()  \t\n') for _ in range(rng.randint(0, 30))))
+
+    def test_invalid_character(self):
+        for text in ['1 + x', '$', '2 ** 3 %']:
+            with self.assertRaises(Exception) as expected:
+                tokens(Lexer(text))
+            with self.assertRaises(Exception) as generated:
+                tokens(self.generator.lexer(text))
+            self.assertEqual(str(generated.exception), str(expected.exception))
+
+    def test_parser_accepts_generated_lexer(self):
+        # The generated lexer is a drop-in for Lexer: the parser builds the same tree
+        text = '3 + 5 - ( 7 - 2 ) * 007 / 1'
+        expected, generated = io.StringIO(), io.StringIO()
+        write_dot(Parser(Lexer(text)).expr(), expected)
+        write_dot(Parser(self.generator.lexer(text)).expr(), generated)
+        self.assertEqual(generated.getvalue(), expected.getvalue())
+
+    def test_custom_converters(self):
+        # Without converters a custom spec keeps the raw lexeme of multi-character patterns
+        generator = LexerGenerator(TokenType, converters={})
+        self.assertEqual(generator.lexer('007').get_next_token().value, '007')
+
+class TestTableLexer(unittest.TestCase):
+    def test_random_texts(self):
+        # Same tokens, values and error as Lexer, both through get_next_token() and iteration
+        rng = random.Random(0)
+        for _ in range(3000):
+            text = random_text(rng)
+            expected = outcome(Lexer(text))
+            self.assertEqual(outcome(TableLexer(text)), expected, repr(text))
+            self.assertEqual(outcome(iter(TableLexer(text))), expected, repr(text))
+
+    def test_spans(self):
+        # spans() gives each token with the exact slice of the text it came from
+        rng = random.Random(1)
+        for _ in range(500):
+            text = ''.join(rng.choice(PLAIN + '٣۴') for _ in range(rng.randint(0, 40)))
+            spans = list(TableLexer(text).spans())
+            self.assertEqual([token for _, _, token in spans] + [Token(TokenType.EOF)], tokens(Lexer(text)))
+            for start, end, token in spans:
+                self.assertEqual(Lexer(text[start:end]).get_next_token(), token)
+
+class Pieces:
+    # File-like source whose read() returns the data in pieces of random length, whatever size
+    # is asked for, so tokens and UTF-8 sequences get split at arbitrary points
+    def __init__(self, data, rng):
+        self.data = data
+        self.pos = 0
+        self.rng = rng
+
+    def read(self, size):
+        end = min(len(self.data), self.pos + self.rng.randint(1, 6))
+        piece = self.data[self.pos:end]
+        self.pos = end
+        return piece
+
+class TestStreamLexer(unittest.TestCase):
+    def test_random_chunks(self):
+        # Text and UTF-8 sources cut at random boundaries lex exactly like the whole text
+        rng = random.Random(2)
+        for _ in range(1500):
+            text = random_text(rng)
+            expected = outcome(Lexer(text))
+            self.assertEqual(outcome(StreamLexer(Pieces(text, rng))), expected, repr(text))
+            self.assertEqual(outcome(iter(StreamLexer(Pieces(text.encode('utf-8'), rng)))), expected, repr(text))
+
+    def test_file(self):
+        # A binary source read in 3-byte chunks, so every two-byte digit is split somewhere
+        text = '١٢ + 3 * (٤٥ - 67)\n' * 50
+        with io.BytesIO(text.encode('utf-8')) as source:
+            self.assertEqual(outcome(StreamLexer(source, chunk_size=3)), outcome(Lexer(text)))
+
+class TestTokenBuffer(unittest.TestCase):
+    def test_random_texts(self):
+        # from_text gives Lexer's stream, or raises Lexer's error and hands out no buffer
+        rng = random.Random(3)
+        for _ in range(3000):
+            text = random_text(rng)
+            expected = outcome(Lexer(text))
+            try:
+                buffer = TokenBuffer.from_text(text)
+            except Exception as error:
+                self.assertEqual((type(error), str(error)), expected[1], repr(text))
+                continue
+            self.assertIsNone(expected[1], repr(text))
+            self.assertEqual(list(buffer), expected[0], repr(text))
+            self.assertEqual(list(TokenBuffer.from_tokens(StreamLexer(Pieces(text, rng)))), expected[0], repr(text))
+
+    def test_offsets(self):
+        text = ' 12 +(٣4 - 5)'
+        buffer = TokenBuffer.from_text(text)
+        self.assertEqual(list(buffer.offsets), [1, 4, 5, 6, 9, 11, 12, len(text)])
+
+    def test_wide_integers(self):
+        # Integers beyond 64 bits go to the `wide` dict and still come back exactly
+        text = f'{1 << 63} + {-1 + (1 << 63)} * {10 ** 30}'
+        buffer = TokenBuffer.from_text(text)
+        self.assertEqual(list(buffer), tokens(Lexer(text)))
+        self.assertEqual(set(buffer.wide), {0, 4})
+
+    def test_parser(self):
+        # Parser reads a buffer by index and builds the same tree as from Lexer
+        text = '3 + 5 - ( 7 - 2 ) * 007 / 1'
+        expected, generated = io.StringIO(), io.StringIO()
+        write_dot(Parser(Lexer(text)).expr(), expected)
+        write_dot(Parser(TokenBuffer.from_text(text)).expr(), generated)
+        self.assertEqual(generated.getvalue(), expected.getvalue())
+
+class TestIncrementalLexer(unittest.TestCase):
+    CHARACTERS = '0123456789+-*/()  \t\n'
+
+    def assertRelexed(self, lexer):
+        # Tokens, starts and lengths must equal a full re-lex of the current text
+        text = lexer.text
+        spans = list(TableLexer(text).spans())
+        self.assertEqual(list(lexer), tokens(Lexer(text)))
+        self.assertEqual(len(lexer), len(spans))
+        self.assertEqual([(lexer.start(i), lexer.start(i) + lexer.length_of(i)) for i in range(len(lexer))],
+                         [(start, end) for start, end, _ in spans])
+
+    def random_edits(self, block, seed):
+        # Random edits, some of them inserting an invalid character, checked after every step
+        lexer_class = type('SmallBlocks', (IncrementalLexer,), {'BLOCK': block}) if block else IncrementalLexer
+        rng = random.Random(seed)
+        for _ in range(60):
+            text = ''.join(rng.choice(self.CHARACTERS) for _ in range(rng.randint(0, 40)))
+            lexer = lexer_class(text)
+            self.assertRelexed(lexer)
+            for _ in range(15):
+                offset = rng.randint(0, len(text))
+                deleted = rng.randint(0, min(5, len(text) - offset))
+                inserted = ''.join(rng.choice(self.CHARACTERS) for _ in range(rng.randint(0, 5)))
+                if rng.random() < 0.1:
+                    inserted += rng.choice('x$²')
+                before = list(lexer)
+                edited = text[:offset] + inserted + text[offset + deleted:]
+                try:
+                    TableLexer(edited).tokenize()
+                except Exception:
+                    # Invalid text: the edit is refused and nothing changes
+                    with self.assertRaises(Exception):
+                        lexer.edit(offset, deleted, inserted)
+                    self.assertEqual(lexer.text, text)
+                    self.assertRelexed(lexer)
+                    continue
+                first, old_stop, new_stop = lexer.edit(offset, deleted, inserted)
+                text = edited
+                self.assertEqual(lexer.text, text)
+                self.assertRelexed(lexer)
+                # Only tokens[first:old_stop] were replaced
+                after = list(lexer)
+                self.assertEqual(before[:first] + after[first:new_stop] + before[old_stop:], after)
+
+    def test_random_edits(self):
+        for seed, block in enumerate([1, 2, 3, None]):
+            with self.subTest(block=block):
+                self.random_edits(block, seed)
+
+    def test_edit_range(self):
+        lexer = IncrementalLexer('1 + 2')
+        self.assertEqual(lexer.edit(0, 1, '33'), (0, 1, 1))
+        self.assertEqual(lexer[0].value, 33)
+        # Deleting the space merges two numbers into one token
+        lexer = IncrementalLexer('12 34')
+        self.assertEqual(lexer.edit(2, 1, ''), (0, 2, 1))
+        self.assertEqual(list(lexer)[:-1], tokens(Lexer('1234'))[:-1])
+
+    def test_edit_outside_text(self):
+        with self.assertRaises(ValueError):
+            IncrementalLexer('1 + 2').edit(4, 2, '')
+
+if __name__ == '__main__':
+    unittest.main()
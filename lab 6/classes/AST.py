@@ -1,19 +1,28 @@
-import networkx as nx
-import matplotlib.pyplot as plt
-
 class ASTNode:
     def add_to_graph(self, graph, parent=None):
         pass  # Base class does nothing
 
+    def label(self):
+        return type(self).__name__
+
+    def children(self):
+        return ()
+
 class BinaryOperator(ASTNode):
     def __init__(self, left, operator, right):
         self.left = left
         self.operator = operator
         self.right = right
 
+    def label(self):
+        return f"{self.operator} (BinaryOperator)"
+
+    def children(self):
+        return (self.left, self.right)
+
     def add_to_graph(self, graph, parent=None):
         # Create a node with a descriptive label
-        operator_label = f"{self.operator} (BinaryOperator)"
+        operator_label = self.label()
         operator_node = f"{self.operator}_{id(self)}"
         graph.add_node(operator_node, label=operator_label)
         if parent:
@@ -27,8 +36,11 @@ class Number(ASTNode):
     def __init__(self, value):
         self.value = value
 
+    def label(self):
+        return f"Value: {self.value}"
+
     def add_to_graph(self, graph, parent=None):
-        value_label = f"Value: {self.value}"
+        value_label = self.label()
         value_node = f"Number_{self.value}_{id(self)}"
         graph.add_node(value_node, label=value_label)
         if parent:
@@ -0,0 +1,69 @@
+# Dependency-free AST exporters. Trees are walked iteratively in post-order and written
+# straight to a text file object, so deep or very large trees need neither recursion nor
+# a plotting backend; memory stays proportional to the tree depth.
+
+def _dot_quote(text):
+    return '"' + str(text).replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+def _xml_escape(text):
+    return str(text).replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;').replace('"', '&quot;')
+
+def _walk(root, visit):
+    # Calls visit(node, depth, child_results) after all children of the node were visited;
+    # whatever visit returns is passed on to the parent as one of its child_results
+    stack = [(root, 0, iter(root.children()), [])]
+    while stack:
+        node, depth, pending, results = stack[-1]
+        child = next(pending, None)
+        if child is not None:
+            stack.append((child, depth + 1, iter(child.children()), []))
+            continue
+        stack.pop()
+        result = visit(node, depth, results)
+        if stack:
+            stack[-1][3].append(result)
+
+def write_dot(root, out, name="AST"):
+    out.write(f"digraph {_dot_quote(name)} {{\n  node [shape=box];\n")
+    counter = [0]
+
+    def visit(node, depth, children):
+        node_id = f"n{counter[0]}"
+        counter[0] += 1
+        out.write(f"  {node_id} [label={_dot_quote(node.label())}];\n")
+        for child_id in children:
+            out.write(f"  {node_id} -> {child_id};\n")
+        return node_id
+
+    _walk(root, visit)
+    out.write("}\n")
+
+def write_svg(root, out, column=90, row=70):
+    # Leaves take consecutive columns and parents are centred over their children, so one
+    # counting pass for the canvas size and one drawing pass are enough
+    size = [0, 0]
+
+    def measure(node, depth, children):
+        size[0] += not children
+        size[1] = max(size[1], depth)
+
+    _walk(root, measure)
+    width, height = size[0] * column + column, size[1] * row + 2 * row
+    out.write(f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" viewBox="0 0 {width} {height}" font-family="sans-serif" font-size="11">\n')
+    leaves = [0]
+
+    def visit(node, depth, children):
+        if children:
+            x = (children[0][0] + children[-1][0]) / 2
+        else:
+            x = column * (leaves[0] + 1)
+            leaves[0] += 1
+        y = row * (depth + 1)
+        for child_x, child_y in children:
+            out.write(f'<line x1="{x:.1f}" y1="{y + 12}" x2="{child_x:.1f}" y2="{child_y - 12}" stroke="black"/>\n')
+        out.write(f'<rect x="{x - column / 2 + 4:.1f}" y="{y - 12}" width="{column - 8}" height="24" rx="6" fill="lightblue" stroke="black"/>')
+        out.write(f'<text x="{x:.1f}" y="{y + 4}" text-anchor="middle" fill="darkred">{_xml_escape(node.label())}</text>\n')
+        return x, y
+
+    _walk(root, visit)
+    out.write('</svg>\n')
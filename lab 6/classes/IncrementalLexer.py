@@ -0,0 +1,171 @@
+from bisect import bisect_left, bisect_right
+
+from .Token import Token
+from .TokenType import TokenType
+from .TableLexer import TableLexer
+
+class IncrementalLexer:
+    # Keeps a document and its tokens up to date under edits. The document is cut into blocks of
+    # at most BLOCK tokens, each cut falling on a token start. Block k owns its piece of the text,
+    # texts[k], its tokens, and their starts (relative to the block) and lengths. Only the
+    # block offsets are global: base(k) is where the block's text begins, first(k) the index of
+    # its first token. They are stored gap-style: before block `gap` they count from the
+    # beginning of the document, from `gap` on from its end (negative). An edit re-lexes and
+    # re-cuts the blocks around it and moves the gap there, so neither the text nor the offsets
+    # behind it are ever rebuilt or shifted one by one.
+    BLOCK = 1024
+
+    def __init__(self, text):
+        spans = list(TableLexer(text).spans())
+        self.length = len(text)
+        self.count = len(spans)
+        (self.texts, self.tokens, self.starts, self.lengths,
+         self.bases, self.firsts) = self._cut(0, 0, text,
+                                              [token for _, _, token in spans],
+                                              [start for start, _, _ in spans],
+                                              [end - start for start, end, _ in spans])
+        self.gap = len(self.texts)
+
+    def _cut(self, base, first, text, tokens, starts, lengths):
+        # Splits a stretch of the document starting at offset `base` and token index `first` into
+        # blocks; `starts` are relative to `base`. Returns the block lists with absolute offsets.
+        texts, block_tokens, block_starts, block_lengths, bases, firsts = [], [], [], [], [], []
+        for i in range(0, len(tokens), self.BLOCK):
+            low = starts[i] if i else 0
+            high = starts[i + self.BLOCK] if i + self.BLOCK < len(tokens) else len(text)
+            texts.append(text[low:high])
+            block_tokens.append(tokens[i:i + self.BLOCK])
+            block_starts.append([start - low for start in starts[i:i + self.BLOCK]])
+            block_lengths.append(lengths[i:i + self.BLOCK])
+            bases.append(base + low)
+            firsts.append(first + i)
+        if not tokens and (text or not base):
+            # Whitespace only; the empty document still has its one (empty) block
+            texts, block_tokens, block_starts, block_lengths, bases, firsts = [text], [[]], [[]], [[]], [base], [first]
+        return texts, block_tokens, block_starts, block_lengths, bases, firsts
+
+    def base(self, k):
+        return self.bases[k] if k < self.gap else self.bases[k] + self.length
+
+    def first(self, k):
+        return self.firsts[k] if k < self.gap else self.firsts[k] + self.count
+
+    def _block_at(self, offset):
+        # The block whose text holds `offset`
+        return bisect_right(range(len(self.texts)), offset, key=self.base) - 1
+
+    def _block_of(self, i):
+        # The block holding token i; a token-less block shares its first() with the next one
+        return bisect_right(range(len(self.texts)), i, key=self.first) - 1
+
+    def _move_gap(self, index):
+        # Costs the distance in blocks between consecutive edits, not the document size
+        n, m = self.length, self.count
+        if self.gap < index:
+            self.bases[self.gap:index] = [base + n for base in self.bases[self.gap:index]]
+            self.firsts[self.gap:index] = [first + m for first in self.firsts[self.gap:index]]
+        elif self.gap > index:
+            self.bases[index:self.gap] = [base - n for base in self.bases[index:self.gap]]
+            self.firsts[index:self.gap] = [first - m for first in self.firsts[index:self.gap]]
+        self.gap = index
+
+    def edit(self, offset, deleted, inserted):
+        # Replaces text[offset:offset + deleted] with `inserted`. Returns the changed range
+        # (first, old_stop, new_stop): the old tokens[first:old_stop] were replaced by what is
+        # now self[first:new_stop]. On an invalid character the exception is raised and nothing
+        # changes.
+        if offset < 0 or deleted < 0 or offset + deleted > self.length:
+            raise ValueError("Edit is outside the text")
+        # The window starts at the block holding the character before the edit (the token ending
+        # right at it may grow) and grows block by block until the new stream resyncs
+        low = self._block_at(max(offset - 1, 0))
+        high = self._block_at(max(offset + deleted - 1, 0)) + 1
+        self._move_gap(low)
+        base = self.base(low)
+        delta = len(inserted) - deleted
+        # Old offsets behind the edit, relative to the window
+        resync = offset + deleted - base
+        while True:
+            old = ''.join(self.texts[low:high])
+            text = old[:offset - base] + inserted + old[offset + deleted - base:]
+            tokens, starts, lengths = [], [], []
+            for k in range(low, high):
+                shift = self.base(k) - base
+                tokens.extend(self.tokens[k])
+                starts.extend(start + shift for start in self.starts[k])
+                lengths.extend(self.lengths[k])
+
+            # The first token that can change is the first one ending at or after the edit: a
+            # token ending before it is followed by untouched whitespace
+            first = bisect_left(range(len(tokens)), offset - base, key=lambda i: starts[i] + lengths[i])
+            lexer = TableLexer(text)
+            lexer.pos = starts[first - 1] + lengths[first - 1] if first else 0
+
+            # Resync once a new token starts where a token from behind the edit used to start:
+            # the text from there on is unchanged, so the rest of the old stream is still valid
+            stop = first
+            new_tokens, new_starts, new_lengths = [], [], []
+            for start, end, token in lexer.spans():
+                while stop < len(tokens) and (starts[stop] < resync or starts[stop] < start - delta):
+                    stop += 1
+                if stop < len(tokens) and starts[stop] == start - delta:
+                    break
+                new_tokens.append(token)
+                new_starts.append(start)
+                new_lengths.append(end - start)
+            else:
+                stop = len(tokens)
+                if high < len(self.texts):
+                    # The window may end inside a token that now runs on into the next block
+                    high += 1
+                    continue
+            break
+
+        count = self.count + len(new_tokens) - (stop - first)
+        first_index = self.first(low)
+        blocks = self._cut(base, first_index, text,
+                           tokens[:first] + new_tokens + tokens[stop:],
+                           starts[:first] + new_starts + [start + delta for start in starts[stop:]],
+                           lengths[:first] + new_lengths + lengths[stop:])
+        self.length += delta
+        self.count = count
+        # The gap sits at `low`, so the new blocks are stored relative to the end
+        texts, block_tokens, block_starts, block_lengths, bases, firsts = blocks
+        self.texts[low:high] = texts
+        self.tokens[low:high] = block_tokens
+        self.starts[low:high] = block_starts
+        self.lengths[low:high] = block_lengths
+        self.bases[low:high] = [b - self.length for b in bases]
+        self.firsts[low:high] = [f - self.count for f in firsts]
+        return first_index + first, first_index + stop, first_index + first + len(new_tokens)
+
+    @property
+    def text(self):
+        # The whole document; joining the blocks costs its full length
+        return ''.join(self.texts)
+
+    def start(self, i):
+        k = self._block_of(i)
+        return self.base(k) + self.starts[k][i - self.first(k)]
+
+    def length_of(self, i):
+        k = self._block_of(i)
+        return self.lengths[k][i - self.first(k)]
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self.count))]
+        if i < 0:
+            i += self.count
+        if not 0 <= i < self.count:
+            raise IndexError("token index out of range")
+        k = self._block_of(i)
+        return self.tokens[k][i - self.first(k)]
+
+    def __iter__(self):
+        for block in self.tokens:
+            yield from block
+        yield Token(TokenType.EOF)
@@ -0,0 +1,294 @@
+from bisect import bisect_right
+
+from .Token import Token
+from .TokenType import TokenType, CONVERTERS
+
+# Code point ranges of the \d \s \w escapes
+ESCAPES = {
+    'd': [(ord('0'), ord('9'))],
+    's': [(ord(c), ord(c)) for c in ' \t\n\r\f\v'],
+    'w': [(ord('0'), ord('9')), (ord('A'), ord('Z')), (ord('_'), ord('_')), (ord('a'), ord('z'))],
+}
+
+class _PatternParser:
+    # Recursive-descent parser for the small regex language of TokenType patterns:
+    # alternation |, grouping ( ), classes [a-z0-9] with ranges, quantifiers * + ?, escapes
+    # \d \s \w and \<char>. Produces Thompson NFA fragments in the shared `nfa` lists.
+    def __init__(self, pattern, nfa):
+        self.pattern = pattern
+        self.pos = 0
+        self.nfa = nfa
+
+    def parse(self):
+        fragment = self.alternation()
+        if self.pos != len(self.pattern):
+            self.error(f"unexpected {self.pattern[self.pos]!r}")
+        return fragment
+
+    def error(self, message):
+        raise ValueError(f"Bad token pattern {self.pattern!r} at {self.pos}: {message}")
+
+    def peek(self):
+        return self.pattern[self.pos] if self.pos < len(self.pattern) else None
+
+    def alternation(self):
+        fragments = [self.concatenation()]
+        while self.peek() == '|':
+            self.pos += 1
+            fragments.append(self.concatenation())
+        if len(fragments) == 1:
+            return fragments[0]
+        start, end = self.nfa.state(), self.nfa.state()
+        for first, last in fragments:
+            self.nfa.epsilon(start, first)
+            self.nfa.epsilon(last, end)
+        return start, end
+
+    def concatenation(self):
+        start = end = self.nfa.state()
+        while self.peek() not in (None, '|', ')'):
+            first, last = self.repetition()
+            self.nfa.epsilon(end, first)
+            end = last
+        return start, end
+
+    def repetition(self):
+        first, last = self.atom()
+        while self.peek() in ('*', '+', '?'):
+            operator = self.pattern[self.pos]
+            self.pos += 1
+            start, end = self.nfa.state(), self.nfa.state()
+            self.nfa.epsilon(start, first)
+            self.nfa.epsilon(last, end)
+            if operator != '+':
+                self.nfa.epsilon(start, end)
+            if operator != '?':
+                self.nfa.epsilon(last, first)
+            first, last = start, end
+        return first, last
+
+    def atom(self):
+        char = self.peek()
+        if char == '(':
+            self.pos += 1
+            fragment = self.alternation()
+            if self.peek() != ')':
+                self.error("missing ')'")
+            self.pos += 1
+            return fragment
+        if char == '[':
+            return self.nfa.edge(self.char_class())
+        if char in ('*', '+', '?'):
+            self.error(f"nothing to repeat before {char!r}")
+        if char == '\\':
+            return self.nfa.edge(self.escape())
+        self.pos += 1
+        return self.nfa.edge([(ord(char), ord(char))])
+
+    def escape(self):
+        self.pos += 1
+        char = self.peek()
+        if char is None:
+            self.error("dangling backslash")
+        self.pos += 1
+        if char in ESCAPES:
+            return ESCAPES[char]
+        return [(ord(char), ord(char))]
+
+    def char_class(self):
+        self.pos += 1
+        ranges = []
+        while self.peek() != ']':
+            if self.peek() is None:
+                self.error("missing ']'")
+            if self.peek() == '\\':
+                ranges.extend(self.escape())
+                continue
+            low = self.pattern[self.pos]
+            self.pos += 1
+            if self.peek() == '-' and self.pos + 1 < len(self.pattern) and self.pattern[self.pos + 1] != ']':
+                high = self.pattern[self.pos + 1]
+                self.pos += 2
+                if high < low:
+                    self.error(f"bad range {low}-{high}")
+                ranges.append((ord(low), ord(high)))
+            else:
+                ranges.append((ord(low), ord(low)))
+        self.pos += 1
+        return ranges
+
+class _NFA:
+    def __init__(self):
+        self.epsilons = []
+        self.edges = []
+
+    def state(self):
+        self.epsilons.append([])
+        self.edges.append([])
+        return len(self.epsilons) - 1
+
+    def epsilon(self, source, target):
+        self.epsilons[source].append(target)
+
+    def edge(self, ranges):
+        start, end = self.state(), self.state()
+        self.edges[start].append((ranges, end))
+        return start, end
+
+class LexerGenerator:
+    # Compiles every pattern of a TokenType enum into one minimized DFA over character classes.
+    # Single-character patterns ('+', '*', '(' ...) are literals, longer ones are regexes; the
+    # EOF member is not matched but returned at the end of input. Lexing takes the longest
+    # match, and on a tie the member declared first wins. Whitespace between tokens is skipped.
+    # Lexemes of a member in `converters` become its token value; for the lab's own TokenType the
+    # default is CONVERTERS (INTEGER -> int), so LexerGenerator().lexer(text) is a drop-in Lexer.
+    def __init__(self, token_types=TokenType, converters=None, eof='EOF'):
+        self.eof = token_types[eof]
+        if converters is None:
+            converters = CONVERTERS if token_types is TokenType else {}
+        self.converters = converters
+        members = [member for member in token_types if member is not self.eof]
+        nfa = _NFA()
+        start = nfa.state()
+        accepts = {}
+        for priority, member in enumerate(members):
+            if len(member.value) == 1:
+                first, last = nfa.edge([(ord(member.value), ord(member.value))])
+            else:
+                first, last = _PatternParser(member.value, nfa).parse()
+            nfa.epsilon(start, first)
+            accepts[last] = priority
+        self.boundaries = self._boundaries(nfa)
+        table, accepting = self._determinize(nfa, start, accepts)
+        self.table, accepting = self._minimize(table, accepting)
+        self.accepting = [None if priority is None else members[priority] for priority in accepting]
+        self._class_cache = {}
+
+    def _boundaries(self, nfa):
+        # Class k holds the code points in [boundaries[k - 1], boundaries[k]); class 0 (below the
+        # first boundary) and the last class (above every range) are never matched
+        points = set()
+        for edges in nfa.edges:
+            for ranges, _ in edges:
+                for low, high in ranges:
+                    points.add(low)
+                    points.add(high + 1)
+        return sorted(points)
+
+    def _class_ranges(self, ranges):
+        classes = set()
+        for low, high in ranges:
+            classes.update(range(bisect_right(self.boundaries, low), bisect_right(self.boundaries, high) + 1))
+        return classes
+
+    def _determinize(self, nfa, start, accepts):
+        class_count = len(self.boundaries) + 1
+        moves = [[(self._class_ranges(ranges), target) for ranges, target in edges] for edges in nfa.edges]
+
+        def closure(states):
+            stack = list(states)
+            seen = set(states)
+            while stack:
+                for target in nfa.epsilons[stack.pop()]:
+                    if target not in seen:
+                        seen.add(target)
+                        stack.append(target)
+            return frozenset(seen)
+
+        first = closure([start])
+        index = {first: 0}
+        subsets = [first]
+        table = []
+        accepting = []
+        while len(table) < len(subsets):
+            subset = subsets[len(table)]
+            row = [-1] * class_count
+            targets = {}
+            for state in subset:
+                for classes, target in moves[state]:
+                    for c in classes:
+                        targets.setdefault(c, set()).add(target)
+            for c, states in targets.items():
+                closed = closure(states)
+                if closed not in index:
+                    index[closed] = len(subsets)
+                    subsets.append(closed)
+                row[c] = index[closed]
+            table.append(row)
+            priorities = [accepts[state] for state in subset if state in accepts]
+            accepting.append(min(priorities) if priorities else None)
+        return table, accepting
+
+    def _minimize(self, table, accepting):
+        # Moore refinement: start from blocks of equal accepted token and split by successor
+        # blocks until stable; the missing transition -1 acts as its own dead block
+        blocks = {}
+        block_of = [blocks.setdefault(priority, len(blocks)) for priority in accepting]
+        while True:
+            signatures = {}
+            refined = [signatures.setdefault((block_of[s],) + tuple(block_of[t] if t >= 0 else -1 for t in row), len(signatures)) for s, row in enumerate(table)]
+            if len(signatures) == len(set(block_of)):
+                break
+            block_of = refined
+        # Renumber so the start state stays 0
+        order = {}
+        for s in range(len(table)):
+            order.setdefault(block_of[s], len(order))
+        minimized = [None] * len(order)
+        minimal_accepting = [None] * len(order)
+        for s, row in enumerate(table):
+            b = order[block_of[s]]
+            if minimized[b] is None:
+                minimized[b] = [order[block_of[t]] if t >= 0 else -1 for t in row]
+                minimal_accepting[b] = accepting[s]
+        return minimized, minimal_accepting
+
+    def char_class(self, char):
+        cached = self._class_cache.get(char)
+        if cached is None:
+            cached = self._class_cache[char] = bisect_right(self.boundaries, ord(char))
+        return cached
+
+    def lexer(self, text):
+        return GeneratedLexer(self, text)
+
+class GeneratedLexer:
+    def __init__(self, generator, text):
+        self.generator = generator
+        self.text = text
+        self.pos = 0
+
+    def get_next_token(self):
+        text = self.text
+        length = len(text)
+        pos = self.pos
+        while pos < length and text[pos].isspace():
+            pos += 1
+        self.pos = pos
+        if pos == length:
+            return Token(self.generator.eof)
+
+        generator = self.generator
+        table, accepting, char_class = generator.table, generator.accepting, generator.char_class
+        state = 0
+        last_type = None
+        last_end = pos
+        while pos < length:
+            state = table[state][char_class(text[pos])]
+            if state < 0:
+                break
+            pos += 1
+            if accepting[state] is not None:
+                last_type, last_end = accepting[state], pos
+        if last_type is None:
+            self.error()
+
+        lexeme = text[self.pos:last_end]
+        self.pos = last_end
+        converter = generator.converters.get(last_type)
+        if converter is not None:
+            return Token(last_type, converter(lexeme))
+        return Token(last_type, None if len(last_type.value) == 1 else lexeme)
+
+    def error(self):
+        raise Exception(f'Invalid character: {self.text[self.pos]}')
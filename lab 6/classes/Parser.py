@@ -1,23 +1,50 @@
+from .Token import Token
 from .TokenType import TokenType
+from .TokenBuffer import TokenBuffer
 from .AST import Number, BinaryOperator
 
 class Parser:
     def __init__(self, lexer):
-        self.lexer = lexer
-        self.current_token = self.lexer.get_next_token()
+        # `lexer` is anything with get_next_token(), or a TokenBuffer that is read by index
+        # without building a Token per step
+        if isinstance(lexer, TokenBuffer):
+            self.lexer = None
+            self.tokens = lexer
+            self.index = 0
+        else:
+            self.lexer = lexer
+            self.tokens = None
+        self.advance()
+
+    def advance(self):
+        if self.tokens is None:
+            token = self.lexer.get_next_token()
+            self.current_type, self.current_value = token.type, token.value
+        else:
+            tokens = self.tokens
+            i = self.index
+            self.current_type = tokens.TYPES[tokens.types[i]]
+            self.current_value = tokens.value_at(i)
+            if i + 1 < len(tokens):
+                self.index = i + 1
+
+    @property
+    def current_token(self):
+        return Token(self.current_type, self.current_value)
 
     def eat(self, token_type):
-        if self.current_token.type == token_type:
-            self.current_token = self.lexer.get_next_token()
+        if self.current_type == token_type:
+            self.advance()
         else:
             raise Exception('Unexpected token type')
 
     def factor(self):
-        token = self.current_token
-        if token.type == TokenType.INTEGER:
+        token_type = self.current_type
+        if token_type == TokenType.INTEGER:
+            value = self.current_value
             self.eat(TokenType.INTEGER)
-            return Number(token.value)
-        elif token.type == TokenType.LPAREN:
+            return Number(value)
+        elif token_type == TokenType.LPAREN:
             self.eat(TokenType.LPAREN)
             node = self.expr()
             self.eat(TokenType.RPAREN)
@@ -25,23 +52,23 @@ class Parser:
 
     def term(self):
         node = self.factor()
-        while self.current_token.type in (TokenType.MULT, TokenType.DIV):
-            token = self.current_token
-            if token.type == TokenType.MULT:
+        while self.current_type in (TokenType.MULT, TokenType.DIV):
+            token_type = self.current_type
+            if token_type == TokenType.MULT:
                 self.eat(TokenType.MULT)
-            elif token.type == TokenType.DIV:
+            elif token_type == TokenType.DIV:
                 self.eat(TokenType.DIV)
-            node = BinaryOperator(left=node, operator=token.type, right=self.factor())
+            node = BinaryOperator(left=node, operator=token_type, right=self.factor())
         return node
 
     def expr(self):
         node = self.term()
-        while self.current_token.type in (TokenType.PLUS, TokenType.MINUS):
-            token = self.current_token
-            if token.type == TokenType.PLUS:
+        while self.current_type in (TokenType.PLUS, TokenType.MINUS):
+            token_type = self.current_type
+            if token_type == TokenType.PLUS:
                 self.eat(TokenType.PLUS)
                 operator = '+'
-            elif token.type == TokenType.MINUS:
+            elif token_type == TokenType.MINUS:
                 self.eat(TokenType.MINUS)
                 operator = '-'
             node = BinaryOperator(left=node, operator=operator, right=self.term())
@@ -0,0 +1,56 @@
+import codecs
+
+from .Token import Token
+from .TokenType import TokenType
+from .TableLexer import TableLexer
+
+class StreamLexer:
+    # Lexes a file object or mmap chunk by chunk, so memory stays bounded by the chunk size
+    # whatever the input size. Only an integer can span two chunks: a trailing digit run is held
+    # back and glued to the next chunk before it is lexed. Bytes (binary files, mmap) are decoded
+    # as UTF-8 incrementally, so a character split across chunks is never broken either.
+    def __init__(self, source, chunk_size=1 << 16, encoding='utf-8'):
+        self.source = source
+        self.chunk_size = chunk_size
+        self.encoding = encoding
+        self._stream = None
+
+    def _chunks(self):
+        decoder = None
+        while True:
+            chunk = self.source.read(self.chunk_size)
+            if isinstance(chunk, (bytes, bytearray)):
+                if decoder is None:
+                    decoder = codecs.getincrementaldecoder(self.encoding)()
+                text = decoder.decode(chunk, final=not chunk)
+            else:
+                text = chunk
+            if text:
+                yield text
+            if not chunk:
+                return
+
+    def __iter__(self):
+        # Same stream as Lexer / TableLexer over the whole text: tokens, then EOF
+        pending = ''
+        for chunk in self._chunks():
+            text = pending + chunk
+            cut = len(text)
+            while cut > 0 and text[cut - 1].isdigit():
+                cut -= 1
+            pending = text[cut:]
+            yield from self._lex(text[:cut])
+        yield from self._lex(pending)
+        yield Token(TokenType.EOF)
+
+    def _lex(self, text):
+        for token in TableLexer(text):
+            if token.type == TokenType.EOF:
+                return
+            yield token
+
+    def get_next_token(self):
+        if self._stream is None:
+            self._stream = iter(self)
+        token = next(self._stream, None)
+        return token if token is not None else Token(TokenType.EOF)
@@ -0,0 +1,85 @@
+from array import array
+
+from .Token import Token
+from .TokenType import TokenType
+from .TableLexer import TableLexer
+
+class TokenBuffer:
+    # Struct-of-arrays token stream: token i is types[i] (an index into TYPES), starts at
+    # offsets[i] in the source and carries values[i]. Integers too wide for 64 bits go to the
+    # `wide` dict instead. That is 17 bytes per token and no per-token objects; Parser reads the
+    # arrays by index, and Token objects are only built when a caller asks for one.
+    TYPES = list(TokenType)
+    CODES = {token_type: code for code, token_type in enumerate(TYPES)}
+    INTEGER = CODES[TokenType.INTEGER]
+    EOF = CODES[TokenType.EOF]
+    LIMIT = 1 << 63
+
+    def __init__(self):
+        self.types = array('B')
+        self.offsets = array('q')
+        self.values = array('q')
+        self.wide = {}
+
+    @classmethod
+    def from_text(cls, text):
+        # Same token stream as Lexer(text), EOF included, scanned by TableLexer; an invalid
+        # character raises the same exception, before the buffer is handed out
+        buffer = cls()
+        codes = cls.CODES
+        types, offsets, values = [], [], []
+        for start, _, token in TableLexer(text).spans():
+            types.append(codes[token.type])
+            offsets.append(start)
+            values.append(token.value or 0)
+        buffer.types.extend(types)
+        buffer.offsets.extend(offsets)
+        try:
+            buffer.values = array('q', values)
+        except OverflowError:
+            # Some integer needs more than 64 bits; only then are values checked one by one
+            for i, value in enumerate(values):
+                if not -cls.LIMIT <= value < cls.LIMIT:
+                    buffer.wide[i] = value
+                    value = 0
+                buffer.values.append(value)
+        buffer.append(cls.EOF, len(text))
+        return buffer
+
+    @classmethod
+    def from_tokens(cls, tokens):
+        # Packs any token stream (e.g. a StreamLexer); source offsets are unknown there, so -1
+        buffer = cls()
+        for token in tokens:
+            buffer.append(cls.CODES[token.type], -1, token.value)
+        if not buffer.types or buffer.types[-1] != cls.EOF:
+            buffer.append(cls.EOF, -1)
+        return buffer
+
+    def append(self, code, offset, value=None):
+        if value is not None and not -self.LIMIT <= value < self.LIMIT:
+            self.wide[len(self.types)] = value
+            value = 0
+        self.types.append(code)
+        self.offsets.append(offset)
+        self.values.append(0 if value is None else value)
+
+    def type_at(self, i):
+        return self.TYPES[self.types[i]]
+
+    def value_at(self, i):
+        if self.types[i] != self.INTEGER:
+            return None
+        return self.wide.get(i, self.values[i]) if self.wide else self.values[i]
+
+    def __len__(self):
+        return len(self.types)
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self.types)
+        return Token(self.type_at(i), self.value_at(i))
+
+    def __iter__(self):
+        for i in range(len(self.types)):
+            yield self[i]
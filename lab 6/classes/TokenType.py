@@ -1,7 +1,7 @@
 from enum import Enum
 
 class TokenType(Enum):
-    INTEGER = '0|[1-9][0-9]*'  # Regex format not used here but illustrates intent
+    INTEGER = '[0-9]+'  # Regex compiled by LexerGenerator; one-character patterns are literals
     PLUS = '+'
     MINUS = '-'
     MULT = '*'
@@ -9,3 +9,6 @@ class TokenType(Enum):
     LPAREN = '('
     RPAREN = ')'
     EOF = '\0'
+
+# Token values LexerGenerator derives from the lexeme, the same ones Lexer produces ('007' -> 7)
+CONVERTERS = {TokenType.INTEGER: int}
@@ -1,9 +1,14 @@
-import matplotlib.pyplot as plt
-import networkx as nx
+import sys
+
 from classes.Lexer import Lexer
 from classes.Parser import Parser
+from classes.ASTExport import write_dot, write_svg
 
 def visualize_ast(root):
+    # The plotting stack is only imported when a window is actually requested
+    import matplotlib.pyplot as plt
+    import networkx as nx
+
     G = nx.DiGraph()  # Directed graph to represent the AST
     root.add_to_graph(G)
     pos = nx.spring_layout(G, seed=42)  # Use a fixed seed for consistent layouts
@@ -16,7 +21,12 @@ def main():
     lexer = Lexer(text)
     parser = Parser(lexer)
     ast = parser.expr()
-    visualize_ast(ast)  # Call to visualize the AST
+    # `python main.py tree.svg` (or tree.dot) exports headlessly instead of opening a window
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], 'w', encoding='utf-8') as out:
+            (write_svg if sys.argv[1].endswith('.svg') else write_dot)(ast, out)
+    else:
+        visualize_ast(ast)  # Call to visualize the AST
 
 if __name__ == "__main__":
     main()